@@ -0,0 +1,137 @@
+"""
+Benchmark suite for the survey rerun hot path.
+
+Runs `survey_app.py` headlessly with Streamlit's `AppTest` harness for surveys with different numbers of question IDs, and records per-rerun latency (for reruns that import survey data, and for unchanged reruns that reuse cached exports), peak memory allocations and timings of individual survey operations. Results are written to a JSON file that can be compared across releases.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --output benchmarks/results.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+# Benchmark the working tree, without requiring the package to be installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streamlit_survey  # noqa: E402
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "survey_app.py")
+SIZES = (10, 1000, 100000)
+
+
+def run_benchmark(n, reruns=5, timeout=600):
+    """
+    Benchmark reruns of the survey app with `n` question IDs.
+
+    Returns
+    -------
+    dict
+        Median rerun latency (ms), median peak allocations (KiB) and median timings of survey operations (ms), for reruns importing survey data and for unchanged reruns
+    """
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state["bench_n"] = n
+    at.run()  # Warm-up run, which also populates survey data
+    if at.exception:
+        raise RuntimeError(f"Benchmark app failed: {at.exception}")
+
+    latencies, operations = {True: [], False: []}, {True: {}, False: {}}
+    for _ in range(reruns):
+        for import_data in (True, False):
+            at.session_state["bench_import"] = import_data
+            start = time.perf_counter()
+            at.run()
+            latencies[import_data].append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(f"Benchmark app failed: {at.exception}")
+            for name, seconds in at.session_state["bench_timings"].items():
+                operations[import_data].setdefault(name, []).append(seconds)
+
+    # Allocations are traced in a separate rerun, as tracing slows down execution.
+    at.session_state["bench_import"] = True
+    tracemalloc.start()
+    at.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "rerun_ms": 1000 * statistics.median(latencies[True]),
+        "rerun_unchanged_ms": 1000 * statistics.median(latencies[False]),
+        "peak_alloc_kib": peak / 1024,
+        "operations_ms": {name: 1000 * statistics.median(seconds) for name, seconds in operations[True].items()},
+        "operations_unchanged_ms": {
+            name: 1000 * statistics.median(seconds) for name, seconds in operations[False].items()
+        },
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print timing ratios against baseline results. Returns the list of regressions larger than `threshold`.
+    """
+    regressions = []
+    for n, result in results["benchmarks"].items():
+        if n not in baseline["benchmarks"]:
+            continue
+        base = baseline["benchmarks"][n]
+        metrics = {}
+        for name in ("rerun_ms", "rerun_unchanged_ms"):
+            if name in result and name in base:
+                metrics[name] = (result[name], base[name])
+        for operations, suffix in (("operations_ms", ""), ("operations_unchanged_ms", " (unchanged)")):
+            for name, value in result.get(operations, {}).items():
+                if name in base.get(operations, {}):
+                    metrics[name + suffix] = (value, base[operations][name])
+        for name, (value, base_value) in metrics.items():
+            ratio = value / base_value if base_value > 0 else float("inf")
+            print(f"n={n:>7} {name:<28} {base_value:10.3f} ms -> {value:10.3f} ms ({ratio:5.2f}x)")
+            if ratio > 1 + threshold:
+                regressions.append((n, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Numbers of question IDs")
+    parser.add_argument("--reruns", type=int, default=5, help="Number of timed reruns per size")
+    parser.add_argument("--output", help="Path of the JSON results file")
+    parser.add_argument("--compare", help="Path of a JSON results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = {
+        "streamlit_survey": streamlit_survey.__version__,
+        "streamlit": streamlit.__version__,
+        "python": platform.python_version(),
+        "benchmarks": {},
+    }
+    for n in args.sizes:
+        results["benchmarks"][str(n)] = run_benchmark(n, reruns=args.reruns)
+        print(f"n={n:>7} rerun: {results['benchmarks'][str(n)]['rerun_ms']:.3f} ms", file=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    else:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
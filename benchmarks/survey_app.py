@@ -0,0 +1,59 @@
+"""
+Streamlit script exercising the survey rerun hot path, run headlessly by `run_benchmarks.py`.
+
+The number of question IDs is read from `st.session_state["bench_n"]`. If `st.session_state["bench_import"]` is True, survey data is re-imported at the start of the rerun, which invalidates cached exports. Otherwise, survey data is unchanged and cached exports are reused. Timings of individual survey operations (in seconds) are stored in `st.session_state["bench_timings"]`.
+"""
+
+import io
+import time
+
+import streamlit as st
+
+import streamlit_survey as ss
+from streamlit_survey.question_record import QuestionRecord
+
+QUESTIONS_PER_PAGE = 10
+N_MICRO = 1000  # Number of `_log`/`_get` calls timed per rerun
+
+n = st.session_state.get("bench_n", 10)
+timings = {}
+
+
+def timed(name, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings[name] = time.perf_counter() - start
+    return result
+
+
+survey = ss.StreamlitSurvey("bench")
+if not survey.data:
+    for i in range(n):
+        survey.data[f"q_{i}"] = QuestionRecord(
+            {"label": f"Question {i}", "value": f"answer {i}", "widget_key": f"bench_q_{i}"}
+        )
+ids = list(survey.data)
+
+# Imports happen in widget callbacks, before widgets are instantiated (see `StreamlitSurvey.importer()`).
+if st.session_state.get("bench_import", True) and "bench_payload" in st.session_state:
+    timed("from_file", survey.from_file, io.StringIO(st.session_state["bench_payload"]))
+
+pages = survey.pages(max(1, n // QUESTIONS_PER_PAGE), label="bench")
+with pages:
+    start = time.perf_counter()
+    first = pages.current * QUESTIONS_PER_PAGE
+    for i in range(first, min(first + QUESTIONS_PER_PAGE, n)):
+        survey.text_input(f"Question {i}", id=f"q_{i}", key=f"bench_q_{i}")
+    timings["display"] = time.perf_counter() - start
+    exit_start = time.perf_counter()
+timings["pages_exit"] = time.perf_counter() - exit_start
+
+micro_ids = ids[:N_MICRO]
+timed("get", lambda: [survey._get(id, "value") for id in micro_ids])
+timed("get_many", survey.get_many, micro_ids)
+timed("log", lambda: [survey._log(id, "value", f"answer {id}") for id in micro_ids])
+
+st.session_state["bench_payload"] = timed("to_json", survey.to_json)
+timed("download_button", survey.download_button, "Download", key="bench_download")
+
+st.session_state["bench_timings"] = timings
@@ -21,7 +21,10 @@ with st.echo(code_location="below"):
 
     survey = ss.StreamlitSurvey()
 
-    with survey.pages(10) as page:
+    # Plots are cached so that the next test case's plot can be prefetched while the current one is reviewed.
+    make_plot = st.cache_resource(show_spinner=False)(mp.make_plot)
+
+    with survey.pages(10, prefetch=make_plot) as page:
         """#### 1. Select test case ID:"""
         st.number_input(
             "test-case",
@@ -36,7 +39,7 @@ with st.echo(code_location="below"):
         """#### 2. Review the test case:"""
         _, center, _ = st.columns(3)
         with center:
-            st.pyplot(mp.make_plot(page.current))
+            st.pyplot(make_plot(page.current))
 
         """#### 3. Log your observations:"""
         error = survey.radio(
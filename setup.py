@@ -8,6 +8,14 @@ with open("HISTORY.rst") as history_file:
 
 requirements = ["streamlit>=1.18.0"]
 
+extras_requirements = {
+    "pandas": ["pandas"],
+    "arrow": ["pyarrow"],
+    "orjson": ["orjson"],
+    "msgpack": ["msgpack"],
+    "yaml": ["pyyaml"],
+}
+
 setup(
     author="Olivier Binette",
     author_email="olivier.binette@gmail.com",
@@ -24,6 +32,7 @@ setup(
     ],
     description="Survey components for Streamlit apps",
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="Commons Clause + Apache License 2.0",
     long_description=readme + "\n\n" + history,
     include_package_data=True,
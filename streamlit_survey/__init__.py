@@ -14,6 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from streamlit_survey.autosave import Autosaver
+from streamlit_survey.collector import ResponseCollector
+from streamlit_survey.instrumentation import SurveyStats
+from streamlit_survey.question_record import QuestionRecord
+from streamlit_survey.rules import RuleEngine
+from streamlit_survey.storage import AppendOnlyFileStorage, MemoryStorage, SQLiteStorage, SurveyStorage
 from streamlit_survey.streamlit_survey import StreamlitSurvey
 from streamlit_survey.survey_component import (
     CheckBox,
@@ -41,6 +47,15 @@ __all__ = [
     "CheckBox",
     "DateInput",
     "TimeInput",
+    "QuestionRecord",
+    "SurveyStats",
+    "SurveyStorage",
+    "MemoryStorage",
+    "SQLiteStorage",
+    "AppendOnlyFileStorage",
+    "RuleEngine",
+    "Autosaver",
+    "ResponseCollector",
 ]
 
 __author__ = """Olivier Binette"""
@@ -0,0 +1,138 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+PathLike = Union[str, bytes, os.PathLike]
+
+
+def _load_values(path: PathLike) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {id: fields.get("value") for id, fields in data.items()}
+
+
+def load_responses(
+    paths: Iterable[PathLike], max_workers: Optional[int] = None, use_processes: bool = False, chunksize: int = 16
+) -> Tuple[List[str], Dict[str, List[Any]]]:
+    """
+    Load many saved survey files in parallel and merge them into a columnar table
+
+    Examples
+    --------
+    >>> import glob
+    >>> from streamlit_survey.aggregate import load_responses, summarize_responses
+    >>> respondents, table = load_responses(glob.glob("responses/*.json"))
+    >>> summaries = summarize_responses(table)
+    >>> summaries["Q1"]["counts"]
+    {'👍': 12, '👎': 3}
+
+    Parameters
+    ----------
+    paths: Iterable[str]
+        Paths to survey JSON files, as written by `StreamlitSurvey.to_json()` or `StreamlitSurvey.download_button()`
+    max_workers: int
+        Maximum number of worker threads or processes
+    use_processes: bool
+        Whether to parse files in a process pool instead of a thread pool. Default is False.
+    chunksize: int
+        Number of files sent to each worker process at once. Only used if `use_processes` is True.
+
+    Returns
+    -------
+    tuple
+        List of respondents (the file paths), and dictionary mapping question IDs to lists of answers, with one entry per respondent (None if the question is missing from the file)
+    """
+    paths = list(paths)
+    if use_processes:
+        with ProcessPoolExecutor(max_workers) as executor:
+            responses = list(executor.map(_load_values, paths, chunksize=chunksize))
+    else:
+        with ThreadPoolExecutor(max_workers) as executor:
+            responses = list(executor.map(_load_values, paths))
+
+    ids = {}  # Ordered set of question IDs
+    for response in responses:
+        ids.update(dict.fromkeys(response))
+
+    respondents = [os.fsdecode(path) for path in paths]
+    table = {id: [response.get(id) for response in responses] for id in ids}
+    return respondents, table
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def summarize_answers(values: List[Any]) -> Dict[str, Any]:
+    """
+    Summarize the answers to a single question
+
+    Numeric answers (e.g. from `Slider` or `NumberInput` components) are summarized by their count, mean, standard deviation, minimum, median and maximum. Other answers are summarized by their count per option, with each option of list-valued answers (e.g. from `MultiSelect` components) counted separately.
+
+    Parameters
+    ----------
+    values: list
+        Answers to the question, with None for missing answers
+
+    Returns
+    -------
+    dict
+        Summary of the answers
+    """
+    answers = [value for value in values if value is not None]
+    summary = {"count": len(answers), "missing": len(values) - len(answers)}
+    if answers and all(_is_number(value) for value in answers):
+        summary["type"] = "numeric"
+        summary["mean"] = statistics.mean(answers)
+        summary["std"] = statistics.stdev(answers) if len(answers) > 1 else 0.0
+        summary["min"] = min(answers)
+        summary["median"] = statistics.median(answers)
+        summary["max"] = max(answers)
+    else:
+        counts = Counter()
+        for value in answers:
+            if isinstance(value, list):
+                counts.update(json.dumps(option) if isinstance(option, (list, dict)) else option for option in value)
+            elif isinstance(value, dict):
+                counts[json.dumps(value)] += 1
+            else:
+                counts[value] += 1
+        summary["type"] = "categorical"
+        summary["counts"] = dict(counts)
+    return summary
+
+
+def summarize_responses(table: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute per-question summaries of a table returned by `load_responses()`
+
+    Parameters
+    ----------
+    table: dict
+        Dictionary mapping question IDs to lists of answers
+
+    Returns
+    -------
+    dict
+        Dictionary mapping question IDs to answer summaries (see `summarize_answers()`)
+    """
+    return {id: summarize_answers(values) for id, values in table.items()}
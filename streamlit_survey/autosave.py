@@ -0,0 +1,254 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Hashable, Mapping, Optional, Union
+
+from streamlit_survey import serializers
+from streamlit_survey.layered_data import LayeredData
+from streamlit_survey.storage import SurveyStorage
+
+PathLike = Union[str, os.PathLike]
+
+
+def atomic_write(path: PathLike, payload: bytes, fsync: bool = True):
+    """
+    Write a file atomically, by writing to a temporary file in the same directory and renaming it over the target. Readers and crashes never see a partially written file.
+    """
+    path = os.fspath(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class Autosaver(object):
+    """
+    Debounced background autosave of survey data.
+
+    Answer changes are coalesced in memory and flushed on a background thread once `max_changes` changes are pending or `interval` seconds after the first pending change, whichever comes first. Rapid edits to the same question (e.g. text area keystrokes) result in a single write. The script run never waits for a flush, and the background thread only runs while changes are pending.
+
+    When saving to a path, the whole survey data is written atomically, in the same format as `StreamlitSurvey.to_json()` by default. Each session should save to its own path. When saving to a storage backend, only the changed questions are written.
+
+    Autosavers saving to a path can be pickled with the session state. Pending changes are kept, and the background thread is restarted when the autosaver is next bound to survey data.
+
+    Examples
+    --------
+    >>> import uuid
+    >>> import streamlit as st
+    >>> import streamlit_survey as ss
+    >>>
+    >>> if "respondent" not in st.session_state:
+    >>>     st.session_state["respondent"] = uuid.uuid4().hex
+    >>> path = f"responses/{st.session_state['respondent']}.json"
+    >>> survey = ss.StreamlitSurvey("My Survey", autosave=path)
+    >>>
+    >>> # Or, with custom flush thresholds:
+    >>> survey = ss.StreamlitSurvey("My Survey", autosave=ss.Autosaver(path, max_changes=50, interval=5))
+    """
+
+    def __init__(
+        self,
+        target: Union[PathLike, SurveyStorage],
+        max_changes: int = 20,
+        interval: float = 2.0,
+        format: str = "json",
+        compression: Optional[str] = None,
+        fsync: bool = True,
+    ):
+        """
+        Parameters
+        ----------
+        target: Union[str, SurveyStorage]
+            Path of the file to save survey data to, or storage backend to write changed questions to
+        max_changes: int
+            Number of pending changes after which survey data is flushed. Default is 20.
+        interval: float
+            Maximum number of seconds between a change and the flush that saves it. Default is 2.
+        format: str
+            Serialization format when saving to a path (see `serializers.dumps()`). Default is "json".
+        compression: str
+            Optional compression when saving to a path (see `serializers.dumps()`).
+        fsync: bool
+            Whether to force saved files to disk before they replace the previous file. Default is True.
+        """
+        if max_changes < 1:
+            raise ValueError("max_changes should be at least 1.")
+        self.target = target
+        self.max_changes = max_changes
+        self.interval = interval
+        self.format = format
+        self.compression = compression
+        self.fsync = fsync
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Dict[Hashable, Any]] = {}  # Changed questions since the last flush, by ID
+        self._replace = False  # Whether all data was replaced since the last flush
+        self._n_changes = 0
+        self._first_change = None  # Time of the first pending change
+        self._thread = None
+        self._write_lock = threading.Lock()  # Serializes flushes from the background thread and `flush()`
+        self._snapshot: Dict[str, Dict[Hashable, Any]] = {}  # Saved survey data, when saving to a path
+        self._base: Mapping[str, Mapping[Hashable, Any]] = {}  # Shared base of copy-on-write survey data
+        self._bound = False
+        self.last_error: Optional[BaseException] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_cond", "_write_lock", "_thread", "_base"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._base = {}
+        if self._first_change is not None:
+            self._first_change = time.monotonic()
+
+    def bind(self, data: Mapping[str, Mapping[Hashable, Any]]):
+        """
+        Start tracking survey data, called for every script run. When saving to a path, the session's data is copied on the first call, so that later flushes only apply pending changes. The shared base of copy-on-write survey data (see `LayeredData`) is referenced rather than copied.
+        """
+        layered = isinstance(data, LayeredData)
+        with self._cond:
+            if not self._bound and not isinstance(self.target, SurveyStorage):
+                records = data.overlay if layered else data
+                self._snapshot = {id: dict(fields) for id, fields in records.items()}
+            self._bound = True
+            self._base = data.base if layered else {}
+            if (self._pending or self._replace) and self._thread is None:
+                # Restart the flush of changes left pending when the autosaver was pickled.
+                self._start()
+
+    def notify(self, id: str, fields: Mapping[Hashable, Any]):
+        """
+        Record that a question changed, with its current fields. Starts the background flush if needed.
+        """
+        with self._cond:
+            self._pending[id] = dict(fields)
+            self._changed()
+
+    def replace(self, data: Mapping[str, Mapping[Hashable, Any]]):
+        """
+        Record that all survey data was replaced.
+        """
+        with self._cond:
+            self._pending = {id: dict(fields) for id, fields in data.items()}
+            self._replace = True
+            self._base = data.base if isinstance(data, LayeredData) else {}
+            self._changed()
+
+    def _changed(self):
+        self._n_changes += 1
+        if self._first_change is None:
+            self._first_change = time.monotonic()
+        if self._thread is None:
+            self._start()
+        elif self._n_changes >= self.max_changes:
+            self._cond.notify()
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="streamlit-survey-autosave", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._replace:
+                    self._thread = None
+                    return
+                deadline = self._first_change + self.interval
+                while (
+                    (self._pending or self._replace)
+                    and self._n_changes < self.max_changes
+                    and time.monotonic() < deadline
+                ):
+                    self._cond.wait(deadline - time.monotonic())
+            try:
+                self.flush()
+            except Exception:
+                # The error is kept in `last_error` and the changes are retried after `interval` seconds.
+                pass
+
+    def _take(self):
+        with self._cond:
+            pending, replace = self._pending, self._replace
+            self._pending, self._replace = {}, False
+            self._n_changes = 0
+            self._first_change = None
+            return pending, replace
+
+    def flush(self):
+        """
+        Save pending changes now, on the calling thread. Errors are stored in `last_error` and re-raised, and the changes are kept pending.
+        """
+        with self._write_lock:
+            pending, replace = self._take()
+            if not pending and not replace:
+                return
+            try:
+                if isinstance(self.target, SurveyStorage):
+                    if replace:
+                        self.target.replace(pending)
+                    else:
+                        for id, fields in pending.items():
+                            for key, value in fields.items():
+                                self.target.write(id, key, value)
+                else:
+                    if replace:
+                        self._snapshot = pending
+                    else:
+                        self._snapshot.update(pending)
+                    base = self._base
+                    data = {**base, **self._snapshot} if base else self._snapshot
+                    payload = serializers.dumps(data, format=self.format, compression=self.compression)
+                    atomic_write(self.target, payload, fsync=self.fsync)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                with self._cond:
+                    # Put the changes back, unless newer changes replaced them in the meantime.
+                    if not self._replace:
+                        pending.update(self._pending)
+                        self._pending = pending
+                        self._replace = replace
+                    self._n_changes = 0
+                    self._first_change = time.monotonic()
+                raise
+
+    def close(self):
+        """
+        Flush pending changes and wait for the background thread to finish.
+        """
+        thread = self._thread
+        self.flush()
+        if thread is not None:
+            with self._cond:
+                self._cond.notify()
+            thread.join()
@@ -0,0 +1,252 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Union
+
+import streamlit as st
+
+from streamlit_survey import serializers
+
+PathLike = Union[str, os.PathLike]
+
+_STOP = object()
+
+
+class ResponseCollector(object):
+    """
+    Process-wide store of submitted survey responses.
+
+    Submissions are put in a bounded thread-safe queue and return immediately. A background writer thread drains the queue and writes submissions in batches, to a SQLite database or to an append-only JSON lines file. A JSON line left incomplete by a crash is truncated when a collector is created for the file. Use `get_collector()` to share one collector between all sessions of a Streamlit app.
+
+    Examples
+    --------
+    >>> import streamlit_survey as ss
+    >>> from streamlit_survey.collector import get_collector
+    >>>
+    >>> collector = get_collector("responses.db")
+    >>> survey = ss.StreamlitSurvey("My Survey")
+    >>> with survey.pages(2, on_submit=lambda: survey.submit(collector)) as pages:
+    >>>     ...
+    """
+
+    BACKENDS = ("sqlite", "jsonl")
+
+    def __init__(
+        self,
+        path: PathLike,
+        backend: Optional[str] = None,
+        maxsize: int = 10000,
+        batch_size: int = 500,
+        table: str = "streamlit_survey_responses",
+    ):
+        """
+        Parameters
+        ----------
+        path: str
+            Path to the SQLite database or JSON lines file
+        backend: str
+            One of "sqlite" or "jsonl". If None, "jsonl" is used for paths ending with ".jsonl" and "sqlite" otherwise.
+        maxsize: int
+            Maximum number of submissions waiting to be written. Default is 10000.
+        batch_size: int
+            Maximum number of submissions written in a single batch. Default is 500.
+        table: str
+            Name of the SQLite table
+        """
+        self.path = os.fspath(path)
+        if backend is None:
+            backend = "jsonl" if self.path.endswith(".jsonl") else "sqlite"
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}. Expected one of {self.BACKENDS}.")
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}.")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.table = table
+        self.last_error: Optional[BaseException] = None
+
+        if backend == "sqlite":
+            with self._connect() as conn:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(id TEXT PRIMARY KEY, survey TEXT, submitted REAL, data TEXT NOT NULL)"
+                )
+            conn.close()
+        elif os.path.exists(self.path):
+            self._truncate_incomplete_line()
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="streamlit-survey-collector", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _truncate_incomplete_line(self, chunk_size: int = 65536):
+        # Truncate the JSON lines file after its last newline, so that new lines are not appended to a line interrupted by a crash. The file is scanned backwards from its end.
+        with open(self.path, "rb+") as f:
+            size = end = f.seek(0, os.SEEK_END)
+            valid_size = 0
+            while end > 0:
+                start = max(0, end - chunk_size)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    valid_size = start + newline + 1
+                    break
+                end = start
+            if valid_size < size:
+                f.truncate(valid_size)
+
+    def submit(self, data: Dict[str, Any], survey: str = "", timeout: Optional[float] = 1.0) -> str:
+        """
+        Queue a survey response to be written
+
+        Parameters
+        ----------
+        data: dict
+            Survey data, mapping question IDs to dictionaries of question fields. The data should not be modified after submission.
+        survey: str
+            Label of the survey
+        timeout: float
+            Maximum number of seconds to wait if the queue is full. If None, wait until there is room in the queue.
+
+        Returns
+        -------
+        str
+            ID of the submission
+
+        Raises
+        ------
+        queue.Full:
+            If the queue is still full after `timeout` seconds
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit responses to a closed collector.")
+        submission = {"id": uuid.uuid4().hex, "survey": survey, "submitted": time.time(), "data": data}
+        self._queue.put(submission, timeout=timeout)
+        return submission["id"]
+
+    def _run(self):
+        conn = self._connect() if self.backend == "sqlite" else None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(submission is _STOP for submission in batch)
+                submissions = [submission for submission in batch if submission is not _STOP]
+                retry = False
+                # Size of the JSON lines file before the batch is written, which is only appended to by this thread.
+                size = os.path.getsize(self.path) if self.backend == "jsonl" and os.path.exists(self.path) else 0
+                while submissions:
+                    try:
+                        if retry and self.backend == "jsonl" and os.path.exists(self.path):
+                            # Remove the complete and incomplete lines written by the failed attempt, which are written again.
+                            os.truncate(self.path, size)
+                        self._write(conn, submissions)
+                        self.last_error = None
+                        break
+                    except Exception as e:
+                        # Keep the batch and retry, so that submissions are not lost. Submitters get backpressure from the bounded queue in the meantime.
+                        self.last_error = e
+                        if stop:
+                            break
+                        retry = True
+                        time.sleep(1.0)
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _write(self, conn: Optional[sqlite3.Connection], submissions: List[Dict[str, Any]]):
+        if self.backend == "sqlite":
+            rows = [
+                (s["id"], s["survey"], s["submitted"], serializers.dumps(s["data"]).decode("utf-8"))
+                for s in submissions
+            ]
+            with conn:
+                conn.executemany(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)", rows)
+        else:
+            lines = b"".join(serializers.dumps(submission) + b"\n" for submission in submissions)
+            with open(self.path, "ab") as f:
+                f.write(lines)
+                f.flush()
+
+    def flush(self):
+        """
+        Wait until all queued submissions have been written.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Write queued submissions and stop the background writer.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def responses(self) -> List[Dict[str, Any]]:
+        """
+        Read the written submissions
+
+        Returns
+        -------
+        list
+            Submissions, as dictionaries with the submission "id", the "survey" label, the "submitted" timestamp and the survey "data"
+        """
+        if self.backend == "sqlite":
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    f"SELECT id, survey, submitted, data FROM {self.table} ORDER BY submitted"
+                ).fetchall()
+            finally:
+                conn.close()
+            return [
+                {"id": id, "survey": survey, "submitted": submitted, "data": json.loads(data)}
+                for id, survey, submitted, data in rows
+            ]
+
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            # A line left incomplete by a crash is ignored until a collector truncates it.
+            return [json.loads(line) for line in f if line.endswith(b"\n")]
+
+
+@st.cache_resource(show_spinner=False)
+def get_collector(path: PathLike, backend: Optional[str] = None, maxsize: int = 10000, batch_size: int = 500):
+    """
+    Return the response collector for a path, shared by all sessions of the Streamlit app. See `ResponseCollector` for the parameters.
+    """
+    return ResponseCollector(path, backend=backend, maxsize=maxsize, batch_size=batch_size)
@@ -0,0 +1,155 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import itertools
+import os
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple, Union
+
+import streamlit as st
+
+from streamlit_survey.file_io import read_json_records
+from streamlit_survey.question_record import FrozenQuestionRecord
+
+PathLike = Union[str, os.PathLike]
+
+
+def _sizeof(obj: Any) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(_sizeof(key) + _sizeof(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_sizeof(value) for value in obj)
+    return size
+
+
+def estimate_size(data: Mapping[str, Mapping], sample_size: int = 1000) -> int:
+    """
+    Estimate the memory used by survey data, in bytes: the mapping, question IDs, records and their field values. Records are measured on an evenly spaced sample of at most about `sample_size` records, so that estimating the size of large survey data is cheap compared to loading it.
+    """
+    size = sys.getsizeof(data)
+    if data:
+        step = max(1, len(data) // sample_size)
+        sample = [_sizeof(id) + _sizeof(record) for id, record in itertools.islice(data.items(), 0, None, step)]
+        size += len(data) * sum(sample) // len(sample)
+    return size
+
+
+class SurveyDataCache(object):
+    """
+    Least-recently-used cache of survey data loaded from JSON files, with a memory cap.
+
+    Entries are keyed by file path and validated against the file's modification time and size, so that changed files are reloaded. Loaded survey data is read-only (a mapping proxy of `FrozenQuestionRecord` objects) and shared by all callers, e.g. read-only `StreamlitSurvey` views in many sessions. The cost of an entry is the estimated memory used by its survey data (see `estimate_size()`), and least recently used entries are evicted once the total cost exceeds `max_bytes`.
+
+    Examples
+    --------
+    >>> import streamlit_survey as ss
+    >>> from streamlit_survey.data_cache import load_survey_data
+    >>>
+    >>> survey = ss.StreamlitSurvey("Review", data=load_survey_data("respondent_1.json"), read_only=True)
+    >>> survey.to_frame()
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        """
+        Parameters
+        ----------
+        max_bytes: int
+            Maximum estimated memory used by cached survey data. Default is 256 MiB. Survey data larger than this is loaded but not cached.
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Mapping, int]]" = (
+            OrderedDict()
+        )  # Path -> (file version, data, estimated size)
+        self._n_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def n_bytes(self) -> int:
+        """
+        Estimated memory used by cached survey data.
+        """
+        return self._n_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, path: PathLike) -> Mapping[str, FrozenQuestionRecord]:
+        """
+        Load read-only survey data from a JSON file, reusing the cached data if the file did not change
+
+        Parameters
+        ----------
+        path: str
+            Path to the JSON file
+
+        Returns
+        -------
+        Mapping
+            Read-only mapping of question IDs to frozen question records
+        """
+        key = os.path.abspath(os.fspath(path))
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Files are loaded without holding the lock, so that loading a large file does not block other sessions. If the file changes while it is loaded, the entry is reloaded on the next call since the file's modification time no longer matches.
+        records = read_json_records(key, record=FrozenQuestionRecord)
+        size = estimate_size(records)
+        data = MappingProxyType(records)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._n_bytes -= previous[2]
+            if size <= self.max_bytes:
+                self._entries[key] = (version, data, size)
+                self._n_bytes += size
+                while self._n_bytes > self.max_bytes:
+                    _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                    self._n_bytes -= evicted_size
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._n_bytes = 0
+
+
+@st.cache_resource(show_spinner=False)
+def get_data_cache(max_bytes: int = 256 * 2**20) -> SurveyDataCache:
+    """
+    Return the survey data cache shared by all sessions of the Streamlit app.
+    """
+    return SurveyDataCache(max_bytes=max_bytes)
+
+
+def load_survey_data(path: PathLike, max_bytes: int = 256 * 2**20) -> Mapping[str, FrozenQuestionRecord]:
+    """
+    Load read-only survey data from a JSON file through the shared survey data cache (see `SurveyDataCache`). Pass the result to a read-only `StreamlitSurvey` view to review answers without copying them.
+    """
+    return get_data_cache(max_bytes).load(path)
@@ -0,0 +1,150 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+import threading
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Dict, Optional, Tuple, Union
+
+from streamlit_survey.autosave import atomic_write
+from streamlit_survey.json_stream import iter_json_items
+
+PathLike = Union[str, bytes, os.PathLike]
+
+URL_SCHEMES = ("http://", "https://", "file://")
+URL_TIMEOUT = 30.0  # Seconds without data from a URL before reading it fails
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class _WriteState(object):
+    """
+    Order of the writes to a file: writes are serialized by `lock`, and versions are assigned in submission order.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submitted = 0  # Version of the last submitted write
+        self.written = 0  # Version of the last completed write
+
+
+_write_states: Dict[str, _WriteState] = {}  # By absolute path
+_write_states_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool used for non-blocking survey imports and exports, created on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="streamlit-survey-io")
+        return _executor
+
+
+def is_url(path: PathLike) -> bool:
+    return isinstance(path, str) and path.startswith(URL_SCHEMES)
+
+
+def open_json(path: PathLike, timeout: Optional[float] = URL_TIMEOUT) -> IO:
+    """
+    Open a JSON file or URL for reading. URL responses are returned unread, so that they can be parsed as they are received. Connecting to a URL and each read of its response fail with a timeout error after `timeout` seconds, so that a stalled server does not block imports forever.
+    """
+    if is_url(path):
+        return urllib.request.urlopen(path, timeout=timeout)
+    return open(path, "r")
+
+
+def parse_json_records(
+    file: IO, stream: bool = False, record: Callable[[Dict[str, Any]], Any] = dict
+) -> Dict[str, Any]:
+    """
+    Parse question records from a JSON file object, mapping question IDs to question fields
+
+    Parameters
+    ----------
+    file: file
+        File object containing the JSON data
+    stream: bool
+        Whether to parse question entries one at a time, so that only the parsed records are kept in memory rather than the whole JSON document. Default is False.
+    record: Callable
+        Record type, called with the fields of each question
+    """
+    items = iter_json_items(file) if stream else json.load(file).items()
+    return {id: record(fields) for id, fields in items}
+
+
+def read_json_records(
+    path: PathLike,
+    stream: Optional[bool] = None,
+    record: Callable[[Dict[str, Any]], Any] = dict,
+    timeout: Optional[float] = URL_TIMEOUT,
+) -> Dict[str, Any]:
+    """
+    Read question records from a JSON file or URL (see `parse_json_records()`)
+
+    Parameters
+    ----------
+    path: str
+        Path or URL of the JSON file
+    stream: bool
+        Whether to parse question entries incrementally. If None, URLs are streamed and files are parsed at once.
+    record: Callable
+        Record type, called with the fields of each question
+    timeout: float
+        Timeout for URLs, in seconds (see `open_json()`)
+    """
+    if stream is None:
+        stream = is_url(path)
+    with open_json(path, timeout=timeout) as f:
+        return parse_json_records(f, stream=stream, record=record)
+
+
+def _next_write(path: PathLike) -> Tuple[_WriteState, int]:
+    key = os.path.abspath(os.fsdecode(path))
+    with _write_states_lock:
+        state = _write_states.get(key)
+        if state is None:
+            state = _write_states[key] = _WriteState()
+        state.submitted += 1
+        return state, state.submitted
+
+
+def _write_version(path: PathLike, payload: str, state: _WriteState, version: int):
+    with state.lock:
+        if version < state.written:
+            # A more recent payload was already written.
+            return
+        atomic_write(path, payload.encode("utf-8"))
+        state.written = version
+
+
+def write_text(path: PathLike, payload: str):
+    """
+    Write a text file atomically (see `autosave.atomic_write()`). Writes to the same file are serialized, and never overwrite a more recently submitted write.
+    """
+    _write_version(path, payload, *_next_write(path))
+
+
+def write_text_nowait(path: PathLike, payload: str) -> Future:
+    """
+    Write a text file atomically on the shared thread pool. Writes to the same file are applied in submission order, and a write is skipped if a more recently submitted write completed first.
+    """
+    return get_executor().submit(_write_version, path, payload, *_next_write(path))
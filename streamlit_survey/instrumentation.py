@@ -0,0 +1,103 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+
+class SurveyStats(object):
+    """
+    Instrumentation counters for a survey rerun.
+
+    Counters are only collected when a `SurveyStats` object is attached to the survey, so that instrumentation has no cost when disabled. An optional callback is called with the name and details of each instrumented event, e.g. to forward them to a metrics pipeline.
+
+    Examples
+    --------
+    >>> import streamlit_survey as ss
+    >>>
+    >>> survey = ss.StreamlitSurvey("My Survey", stats=True)
+    >>> survey.text_input("What is your name?")
+    >>> survey.stats.to_dict()
+    {'components_registered': 1, 'register_seconds': {'TextInput': 0.0012}, 'log_writes': 3, ...}
+
+    Using a callback:
+
+    >>> stats = ss.SurveyStats(callback=lambda event, data: print(event, data))
+    >>> survey = ss.StreamlitSurvey("My Survey", stats=stats)
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        """
+        Parameters
+        ----------
+        callback: Callable
+            Function called with the event name ("register", "log", "serialize" or "restore") and a dictionary of event details.
+        """
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all counters.
+        """
+        self.components_registered = 0
+        self.register_seconds = {}  # Time spent in `register()` per component class
+        self.log_writes = 0
+        self.log_bytes = 0  # Size of written values, as JSON
+        self.serialize_seconds = 0.0
+        self.restores = 0  # Widget values restored in `st.session_state` by imports
+
+    def on_component(self, component):
+        self.components_registered += 1
+
+    def on_register(self, component, seconds: float):
+        name = type(component).__name__
+        self.register_seconds[name] = self.register_seconds.get(name, 0.0) + seconds
+        if self.callback is not None:
+            self.callback("register", {"component": name, "id": component.id, "seconds": seconds})
+
+    def on_log(self, id: str, key: Any, value: Any):
+        size = len(json.dumps(value, default=str))
+        self.log_writes += 1
+        self.log_bytes += size
+        if self.callback is not None:
+            self.callback("log", {"id": id, "key": key, "size": size})
+
+    def on_serialize(self, format: str, seconds: float, size: int):
+        self.serialize_seconds += seconds
+        if self.callback is not None:
+            self.callback("serialize", {"format": format, "seconds": seconds, "size": size})
+
+    def on_restore(self, id: str, widget_key: str):
+        self.restores += 1
+        if self.callback is not None:
+            self.callback("restore", {"id": id, "widget_key": widget_key})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            Current counter values
+        """
+        return {
+            "components_registered": self.components_registered,
+            "register_seconds": dict(self.register_seconds),
+            "log_writes": self.log_writes,
+            "log_bytes": self.log_bytes,
+            "serialize_seconds": self.serialize_seconds,
+            "restores": self.restores,
+        }
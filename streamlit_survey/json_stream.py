@@ -0,0 +1,124 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import codecs
+import json
+from typing import IO, Any, Iterator, Tuple
+
+WHITESPACE = " \t\n\r"
+
+
+class _Reader(object):
+    """
+    Buffered reader over a text or binary file, keeping only the unparsed part of the file in memory.
+    """
+
+    def __init__(self, file: IO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Read the next chunk of the file. Returns False at the end of the file.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        while isinstance(chunk, bytes):
+            data = chunk
+            chunk = self.decoder.decode(data, final=not data)
+            if data and not chunk:
+                # Chunk ended inside a multi-byte character.
+                chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the parsed part of the buffer before appending the new chunk.
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character, or an empty string at the end of the file.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos : self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """
+        Decode the next JSON value, reading more of the file as needed.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+                # A value ending at the end of the buffer may be truncated (e.g. a number split across chunks).
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_json_items(file: IO, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a JSON object from a file, yielding its items one at a time
+
+    Only the item being parsed is held in memory, rather than the whole document.
+
+    Parameters
+    ----------
+    file: file
+        Text or binary (UTF-8) file object containing a JSON object
+    chunk_size: int
+        Number of characters or bytes read from the file at once
+
+    Yields
+    ------
+    tuple
+        Key and value of each item of the JSON object
+    """
+    reader = _Reader(file, chunk_size)
+    decoder = json.JSONDecoder()
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        if reader.peek() != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", reader.buffer, reader.pos)
+        key = reader.value(decoder)
+        reader.expect(":")
+        yield key, reader.value(decoder)
+        if reader.expect(",}") == "}":
+            return
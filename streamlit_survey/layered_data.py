@@ -0,0 +1,113 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections.abc import MutableMapping
+from types import MappingProxyType
+from typing import Any, Hashable, Iterator, Mapping
+
+from streamlit_survey.question_record import QuestionRecord
+
+_EMPTY = MappingProxyType({})
+
+
+class LayeredData(MutableMapping):
+    """
+    Copy-on-write survey data: a session overlay of changed question records on top of a shared read-only base.
+
+    Reads fall through to the base for questions that were not changed in the session, and return base records as is. Writes only go to the overlay, and base records are copied into the overlay the first time they are modified (see `writable()`), so the base is never modified and can be shared by all sessions without copying it.
+
+    The base is not pickled with the session state. It is attached again by `rebase()`, which `StreamlitSurvey` calls on every script run with its `base` argument.
+    """
+
+    def __init__(self, base: Mapping[str, Mapping[Hashable, Any]] = _EMPTY):
+        """
+        Parameters
+        ----------
+        base: Mapping
+            Shared read-only survey data, e.g. loaded with `streamlit_survey.data_cache.load_survey_data()`
+        """
+        self.base = base
+        self.overlay = {}  # Records added or changed in the session, by question ID
+        self.deleted = set()  # IDs of base records deleted in the session
+        self.detached = False  # Whether the base was detached by `clear()`
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["base"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.base = _EMPTY
+
+    def __getitem__(self, id: str) -> Mapping[Hashable, Any]:
+        if id in self.overlay:
+            return self.overlay[id]
+        if id in self.deleted:
+            raise KeyError(id)
+        return self.base[id]
+
+    def __setitem__(self, id: str, record: QuestionRecord):
+        self.overlay[id] = record
+        self.deleted.discard(id)
+
+    def __delitem__(self, id: str):
+        if id not in self:
+            raise KeyError(id)
+        self.overlay.pop(id, None)
+        if id in self.base:
+            self.deleted.add(id)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self.overlay or (id in self.base and id not in self.deleted)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.overlay
+        for id in self.base:
+            if id not in self.overlay and id not in self.deleted:
+                yield id
+
+    def __len__(self) -> int:
+        n_base = len(self.base) - len(self.deleted)
+        return n_base + sum(1 for id in self.overlay if id not in self.base or id in self.deleted)
+
+    def clear(self):
+        """
+        Remove all records. The base is detached rather than masked record by record.
+        """
+        self.base = _EMPTY
+        self.detached = True
+        self.overlay.clear()
+        self.deleted.clear()
+
+    def rebase(self, base: Mapping[str, Mapping[Hashable, Any]]):
+        """
+        Replace the shared base, e.g. after its file was reloaded, keeping the session's changes. Ignored once the base was detached by `clear()`.
+        """
+        if not self.detached and base is not self.base:
+            self.base = base
+            # Deletions of records that are not in the new base no longer mask anything.
+            self.deleted = {id for id in self.deleted if id in base}
+
+    def writable(self, id: str) -> QuestionRecord:
+        """
+        Return the session's own record for a question, copying the base record into the overlay on first write.
+        """
+        if id in self.overlay:
+            return self.overlay[id]
+        record = QuestionRecord(self[id])
+        self.overlay[id] = record
+        return record
@@ -1,8 +1,162 @@
-from typing import Union
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Set, Tuple, Union
 
 import streamlit as st
 
 
+def _is_answered(value: Any) -> bool:
+    return value is not None and not (isinstance(value, (str, list, tuple)) and len(value) == 0)
+
+
+def _add(index: Dict[Hashable, Dict[int, Set[str]]], group: Hashable, page: int, id: str):
+    index.setdefault(group, {}).setdefault(page, set()).add(id)
+
+
+def _remove(index: Dict[Hashable, Dict[int, Set[str]]], group: Hashable, page: int, id: str):
+    pages = index.get(group, {})
+    if page in pages:
+        pages[page].discard(id)
+        if not pages[page]:
+            del pages[page]
+
+
+class PageIndex(object):
+    """
+    Index of the survey questions displayed on each page of page groups, of those that have answers, and of required questions that are still unanswered.
+
+    The index is updated incrementally as pages are visited, as components are displayed within pages and as answers are logged, so that page navigation and completion checks never scan survey data. Questions are indexed once they have been displayed on a page, or located with the `page_of` function of their page group (see `locate()`), e.g. for answers imported or loaded from storage before their page is displayed.
+
+    The initial value of a widget (e.g. the first option of a radio or an unchecked checkbox) is not an answer: a question is only answered once its value is changed by the user or imported.
+    """
+
+    def __init__(self):
+        self.page_of: Dict[str, Tuple[Hashable, int]] = {}  # Question ID -> (page group key, page index)
+        self.ids: Dict[Hashable, Dict[int, Set[str]]] = {}  # Page group key -> page index -> question IDs
+        self.answered: Dict[Hashable, Dict[int, Set[str]]] = {}  # Page group key -> page index -> answered question IDs
+        self.required: Dict[Hashable, Dict[int, Set[str]]] = {}  # Page group key -> page index -> required question IDs
+        # Page group key -> page index -> unanswered required question IDs
+        self.missing: Dict[Hashable, Dict[int, Set[str]]] = {}
+        self.visited: Dict[Hashable, Set[int]] = {}  # Page group key -> indices of visited pages
+        self.defaults: Set[str] = set()  # IDs of questions whose value is still their widget's initial value
+        self.unlocated: List[str] = []  # IDs of questions with values that were not indexed, in order of first change
+        self._unlocated_ids: Set[str] = set()
+        self.located: Dict[Hashable, int] = {}  # Page group key -> number of unlocated IDs already located
+
+    def visit(self, group: Hashable, page: int):
+        """
+        Record that a page has been displayed.
+        """
+        self.visited.setdefault(group, set()).add(page)
+
+    def assign(self, id: str, group: Hashable, page: int, value: Any = None, required: bool = False):
+        """
+        Record that a question is displayed on a page, along with its current value and whether it is required.
+        """
+        location = (group, page)
+        previous = self.page_of.get(id)
+        if previous != location:
+            if previous is not None:
+                for index in (self.ids, self.answered, self.required, self.missing):
+                    _remove(index, *previous, id)
+            self.page_of[id] = location
+            _add(self.ids, group, page, id)
+        if required:
+            _add(self.required, group, page, id)
+        else:
+            _remove(self.required, group, page, id)
+        self._index_value(id, value)
+
+    def set_value(self, id: str, value: Any, default: bool = False):
+        """
+        Update the answered status of a question after its value changed. The status of questions that are not indexed yet is computed when they are displayed on a page.
+
+        Parameters
+        ----------
+        id: str
+            Question ID
+        value: Any
+            New value of the question
+        default: bool
+            Whether the value is the initial value of the question's widget, rather than user input or imported data
+        """
+        if default:
+            self.defaults.add(id)
+        else:
+            self.defaults.discard(id)
+        if id not in self.page_of and id not in self._unlocated_ids:
+            self.unlocated.append(id)
+            self._unlocated_ids.add(id)
+        self._index_value(id, value)
+
+    def locate(self, group: Hashable, page_of: Callable[[str], Optional[int]], data: Mapping[str, Mapping]):
+        """
+        Index the questions of survey data that are not indexed yet, under the page of a page group given by `page_of`. Survey data is only scanned the first time a page group is located, and later calls only locate questions whose values changed in the meantime.
+
+        Parameters
+        ----------
+        group: Hashable
+            Page group key
+        page_of: Callable
+            Function returning the index of the page of the page group displaying a question, given its ID, or None if the question is not displayed by the page group
+        data: Mapping
+            Survey data
+        """
+        start = self.located.get(group)
+        ids = list(data) if start is None else self.unlocated[start:]
+        self.located[group] = len(self.unlocated)
+        for id in ids:
+            if id in self.page_of:
+                continue
+            page = page_of(id)
+            if page is None:
+                continue
+            self.page_of[id] = (group, page)
+            _add(self.ids, group, page, id)
+            record = data.get(id)
+            self._index_value(id, None if record is None else record.get("value"))
+
+    def relocate(self):
+        """
+        Locate all questions of survey data again, e.g. after survey data was replaced.
+        """
+        self.unlocated.clear()
+        self._unlocated_ids.clear()
+        self.located.clear()
+
+    def _index_value(self, id: str, value: Any):
+        location = self.page_of.get(id)
+        if location is None:
+            return
+        group, page = location
+        answered = id not in self.defaults and _is_answered(value)
+        if answered:
+            _add(self.answered, group, page, id)
+        else:
+            _remove(self.answered, group, page, id)
+        if not answered and id in self.required.get(group, {}).get(page, ()):
+            _add(self.missing, group, page, id)
+        else:
+            _remove(self.missing, group, page, id)
+
+    def answered_pages(self, group: Hashable) -> Set[int]:
+        """
+        Indices of the pages of a page group with at least one answered question.
+        """
+        return self.answered.get(group, {}).keys()
+
+    def incomplete_pages(self, group: Hashable) -> Set[int]:
+        """
+        Indices of the pages of a page group with unanswered required questions.
+        """
+        return self.missing.get(group, {}).keys()
+
+    def n_completed(self, group: Hashable) -> int:
+        """
+        Number of completed pages of a page group: pages with answers and no unanswered required questions, and visited pages without questions.
+        """
+        answered = self.answered.get(group, {}).keys() - self.incomplete_pages(group)
+        return len(answered) + len(self.visited.get(group, set()) - self.ids.get(group, {}).keys())
+
+
 class Pages(object):
 
     @staticmethod
@@ -27,20 +181,64 @@ class Pages(object):
 
     @staticmethod
     def default_btn_submit(label="Submit"):
-        return lambda pages: st.button(label, use_container_width=True, key=f"{pages.current_page_key}_btn_next")
+        return lambda pages: st.button(label, use_container_width=True, key=f"{pages.current_page_key}_btn_submit")
 
-    def __init__(self, labels: Union[int, list], key="__Pages_curent", on_submit=None, progress_bar=False):
+    @staticmethod
+    def default_btn_next_unanswered(label="Next unanswered"):
+        return lambda pages: st.button(
+            label,
+            use_container_width=True,
+            on_click=pages.next_unanswered,
+            key=f"{pages.current_page_key}_btn_next_unanswered",
+        )
+
+    @staticmethod
+    def default_jump_input(label="Go to page"):
+        def jump_input(pages):
+            key = f"{pages.current_page_key}_jump"
+            # The input is synced with the current page before it is displayed, instead of passing a default value.
+            st.session_state[key] = pages.current
+            return st.number_input(
+                label,
+                min_value=0,
+                max_value=pages.n_pages - 1,
+                step=1,
+                key=key,
+                on_change=lambda: pages.update(st.session_state[key]),
+            )
+
+        return jump_input
+
+    def __init__(
+        self,
+        labels: Union[int, list],
+        key="__Pages_curent",
+        on_submit=None,
+        progress_bar=False,
+        prefetch: Optional[Callable[[int], Any]] = None,
+        jump: bool = False,
+        survey=None,
+        page_of: Optional[Callable[[str], Optional[int]]] = None,
+    ):
         """
         Parameters
         ----------
-        labels: int
-            Number of pages
+        labels: Union[int, range, list]
+            Number of pages, range or list of page labels, or list of page functions. Page numbers are not materialized, so that page groups can have a large number of pages. Page functions are called without arguments to display their page, and their names are used as page labels.
         key: str
             Key to use to store the current page in Streamlit's session state
         on_submit: Callable
             Callback to call when the user clicks the submit button
         progress_bar: bool
-            Whether to show a progress bar under the survey buttons. Default is False.
+            Whether to show a progress bar under the survey buttons. Default is False. When the pages are attached to a survey, the progress bar shows the fraction of completed pages, i.e. pages with answers and without unanswered required questions. Otherwise, it shows the position of the current page.
+        prefetch: Callable
+            Optional function called with the index of the next page once the current page is displayed. Use it with a function cached with `st.cache_data` or `st.cache_resource` to precompute the next page's data.
+        jump: bool
+            Whether to show a page number input and a "Next unanswered" button under the survey buttons. Default is False.
+        survey: StreamlitSurvey
+            Survey whose questions are displayed in the pages. Questions displayed within the pages are indexed by page, which is used to find unanswered pages and to check completion before calling `on_submit`.
+        page_of: Callable
+            Optional function returning the index of the page displaying a question, given its ID, or None if the question is not displayed by the pages. Answers imported or loaded from storage are only indexed once their page is displayed, unless their page can be found with `page_of`.
 
         Example
         -------
@@ -50,18 +248,83 @@ class Pages(object):
         >>>         st.text_input("Email address:", id="email")
         >>>     if page.current == 1:
         >>>         st.text_input("Phone number:", id="phone")
+
+        Using page functions, only the current page's function is run:
+
+        >>> page = Pages(["Email", "Phone"])
+        >>>
+        >>> @page.page("Email")
+        >>> def email():
+        >>>     st.text_input("Email address:", id="email")
+        >>>
+        >>> @page.page("Phone")
+        >>> def phone():
+        >>>     st.text_input("Phone number:", id="phone")
+        >>>
+        >>> page.run()
         """
+        self._bodies = {}  # Page functions, by page index
         if isinstance(labels, int):
-            labels = list(range(labels))
+            labels = range(labels)
+        elif not isinstance(labels, range) and any(callable(label) for label in labels):
+            self._bodies = dict(enumerate(labels))
+            labels = [getattr(body, "__name__", i) for i, body in enumerate(labels)]
         self.n_pages = len(labels)
         self.labels = labels
         self.current_page_key = key
         self.on_submit = on_submit
         self.progress_bar = progress_bar
+        self.prefetch = prefetch
+        self.jump = jump
+        self.survey = survey
+        self.page_of = page_of
+        self._locate()
 
         self._prev_btn = Pages.default_btn_previous()
         self._next_btn = Pages.default_btn_next()
         self._submit_btn = Pages.default_btn_submit()
+        self._next_unanswered_btn = Pages.default_btn_next_unanswered()
+        self._jump_input = Pages.default_jump_input()
+
+    def _locate(self):
+        if self.survey is not None and self.page_of is not None:
+            self.survey.page_index.locate(self.current_page_key, self.page_of, self.survey.data)
+
+    def page(self, label: Any = None) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+        """
+        Decorator registering a function displaying a page. Only the current page's function is run, after the body of the `with` statement or when calling `run()`.
+
+        Parameters
+        ----------
+        label: Any
+            Label of the page. If None, the function is registered for the first page without a function.
+
+        Raises
+        ------
+        ValueError:
+            If there is no page with the given label, or if all pages already have a function
+        """
+        if label is None:
+            index = next((i for i in range(self.n_pages) if i not in self._bodies), None)
+            if index is None:
+                raise ValueError("All pages already have a page function.")
+        elif label in self.labels:
+            index = self.labels.index(label)
+        else:
+            raise ValueError(f"Unknown page label {label!r}.")
+
+        def decorator(body):
+            self._bodies[index] = body
+            return body
+
+        return decorator
+
+    def run(self):
+        """
+        Display the current page's function and the navigation buttons.
+        """
+        with self:
+            pass
 
     def update(self, value):
         """
@@ -122,6 +385,84 @@ class Pages(object):
         if self.current < self.n_pages - 1:
             self.current += 1
 
+    def is_answered(self, page: int) -> bool:
+        """
+        Whether a page has at least one answered question. Always False if the pages are not attached to a survey.
+        """
+        if self.survey is None:
+            return False
+        return page in self.survey.page_index.answered_pages(self.current_page_key)
+
+    def find_unanswered(self, start: int = 0) -> Optional[int]:
+        """
+        Find the first page without answers, starting at the given page index and wrapping around
+
+        Only answered pages are skipped, so the search is bounded by the number of answered pages rather than the number of pages.
+
+        Returns
+        -------
+        int
+            Index of the first page without answers, or None if all pages have answers
+        """
+        # Answers imported after the pages were created, e.g. by a callback, are located first.
+        self._locate()
+        answered = self.survey.page_index.answered_pages(self.current_page_key) if self.survey is not None else ()
+        if len(answered) >= self.n_pages:
+            return None
+        page = start % self.n_pages
+        while page in answered:
+            page = (page + 1) % self.n_pages
+        return page
+
+    def next_unanswered(self):
+        """
+        Go to the next page without answers
+        """
+        page = self.find_unanswered(self.current + 1)
+        if page is not None:
+            self.current = page
+
+    def is_complete(self) -> bool:
+        """
+        Whether all required questions displayed so far are answered. Always True if the pages are not attached to a survey.
+
+        With `jump=True`, pages can be skipped, so every page must also have been visited: the required questions of a page are only known once it is displayed.
+        """
+        if self.survey is None:
+            return True
+        index = self.survey.page_index
+        if self.jump and len(index.visited.get(self.current_page_key, ())) < self.n_pages:
+            return False
+        return not index.incomplete_pages(self.current_page_key)
+
+    @property
+    def completion(self) -> float:
+        """
+        Fraction of completed pages, i.e. pages with answers and no unanswered required questions, and visited pages without questions.
+        """
+        if self.survey is None:
+            return 0.0
+        return self.survey.page_index.n_completed(self.current_page_key) / self.n_pages
+
+    def find_resume(self) -> int:
+        """
+        Find the page to resume the survey at: the first page with unanswered required questions or that has not been visited yet. Returns the last page if the survey is complete.
+        """
+        if self.survey is None:
+            return self.current
+        index = self.survey.page_index
+        visited = index.visited.get(self.current_page_key, ())
+        page = 0
+        while page < self.n_pages - 1 and page in visited:
+            page += 1
+        return min(page, min(index.incomplete_pages(self.current_page_key), default=page))
+
+    def resume(self):
+        """
+        Go to the first incomplete page (see `find_resume()`)
+        """
+        self.current = self.find_resume()
+
     @property
     def prev_button(self):
         """
@@ -179,13 +520,65 @@ class Pages(object):
         """
         self._submit_btn = func
 
+    @property
+    def next_unanswered_button(self):
+        """
+        Returns "next unanswered" button for page navigation.
+        """
+        return self._next_unanswered_btn(self)
+
+    @next_unanswered_button.setter
+    def next_unanswered_button(self, func):
+        """
+        Set "next unanswered" button for page navigation.
+
+        Parameters
+        ----------
+        func: function
+            Function taking one argument (the current page instance) and returning the "next unanswered" button for page navigation.
+        """
+        self._next_unanswered_btn = func
+
+    @property
+    def jump_input(self):
+        """
+        Returns page number input for page navigation.
+        """
+        return self._jump_input(self)
+
+    @jump_input.setter
+    def jump_input(self, func):
+        """
+        Set page number input for page navigation.
+
+        Parameters
+        ----------
+        func: function
+            Function taking one argument (the current page instance) and returning the page number input for page navigation.
+        """
+        self._jump_input = func
+
     def __enter__(self):
+        if self.survey is not None:
+            # Components registered while the pages are active are indexed under the current page.
+            self.survey._active_page = (self.current_page_key, self.current)
+            self.survey.page_index.visit(self.current_page_key, self.current)
         return self
 
     def __exit__(self, type, value, traceback):
         """
-        Display the navigation buttons
+        Display the current page's function and the navigation buttons
         """
+        try:
+            body = self._bodies.get(self.current) if type is None else None
+            if body is not None:
+                body()
+        finally:
+            if self.survey is not None:
+                self.survey._active_page = None
+        if type is not None:
+            return
+
         submitted = False
         left, _, right = st.columns([2, 4, 2])
         with left:
@@ -195,7 +588,20 @@ class Pages(object):
                 submitted = self.submit_button
             else:
                 self.next_button
-        if self.progress_bar and self.n_pages > 1:
+        if self.jump:
+            left, right = st.columns([6, 2])
+            with left:
+                self.jump_input
+            with right:
+                self.next_unanswered_button
+        if self.progress_bar and self.survey is not None:
+            st.progress(self.completion)
+        elif self.progress_bar and self.n_pages > 1:
             st.progress(self.current / (self.n_pages - 1))
         if submitted:
-            self.on_submit()
+            if self.is_complete():
+                self.on_submit()
+            else:
+                st.warning("Please answer all required questions before submitting.")
+        if self.prefetch is not None and self.current < self.n_pages - 1:
+            self.prefetch(self.current + 1)
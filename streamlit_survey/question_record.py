@@ -0,0 +1,141 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Hashable, Mapping
+
+
+class QuestionRecord(MutableMapping):
+    """
+    Compact record holding the data of a single survey question.
+
+    Standard fields ("label", "widget_key", "value" and the "timestamp" of the last change) are stored in slots, while other fields logged by custom components are kept in a dictionary that is only allocated when needed. Records behave like dictionaries where missing fields read as None, and they can be pickled.
+    """
+
+    FIELDS = ("label", "widget_key", "value", "timestamp")
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, fields: Mapping[Hashable, Any] = ()):
+        """
+        Parameters
+        ----------
+        fields: dict
+            Initial field values
+        """
+        self.extra = None
+        for key, value in fields.items() if hasattr(fields, "items") else fields:
+            if key in _FIELD_NAMES:
+                setattr(self, key, value)
+            else:
+                self[key] = value
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if key in QuestionRecord.FIELDS:
+            return getattr(self, key, None)
+        if self.extra is None:
+            return None
+        return self.extra.get(key)
+
+    def __setitem__(self, key: Hashable, value: Any):
+        if key in QuestionRecord.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: Hashable):
+        if key not in self:
+            raise KeyError(key)
+        if key in QuestionRecord.FIELDS:
+            delattr(self, key)
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        if key in QuestionRecord.FIELDS:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for key in QuestionRecord.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def to_dict(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Dictionary of the record's fields
+        """
+        data = {}
+        for key in QuestionRecord.FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"QuestionRecord({self.to_dict()!r})"
+
+
+class FrozenQuestionRecord(QuestionRecord):
+    """
+    Read-only question record, for survey data shared between sessions (see `streamlit_survey.data_cache`).
+    """
+
+    __slots__ = ()
+
+    def __init__(self, fields: Mapping[Hashable, Any] = ()):
+        self.extra = None
+        for key, value in fields.items() if hasattr(fields, "items") else fields:
+            QuestionRecord.__setitem__(self, key, value)
+
+    def __setitem__(self, key: Hashable, value: Any):
+        raise TypeError("Frozen question records cannot be modified.")
+
+    def __delitem__(self, key: Hashable):
+        raise TypeError("Frozen question records cannot be modified.")
+
+    def __repr__(self):
+        return f"FrozenQuestionRecord({self.to_dict()!r})"
+
+
+_FIELD_NAMES = frozenset(QuestionRecord.FIELDS)
+_MISSING = object()
+
+
+def encode_record(obj: Any) -> dict:
+    """
+    JSON encoder hook for `QuestionRecord` objects and read-only mappings of survey data, to be passed as the `default` argument of `json.dump()`.
+    """
+    if isinstance(obj, QuestionRecord):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
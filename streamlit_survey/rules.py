@@ -0,0 +1,214 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Set, Tuple
+
+
+class Rule(NamedTuple):
+    """
+    Display rule of a survey question.
+    """
+
+    depends_on: Tuple[str, ...]  # IDs of the questions the rule depends on
+    predicate: Callable[..., bool]  # Called with the values of the `depends_on` questions
+
+
+class RuleEngine(object):
+    """
+    Show/hide rules for survey questions, compiled into a dependency graph over question IDs.
+
+    A question is reachable if its rule holds and all questions its rule depends on are reachable. Questions without a rule are always reachable. When bound to a survey (see `StreamlitSurvey`), reachability is cached in the session state, and answer changes only invalidate the questions that depend on them.
+
+    Rule engines hold no session data and can be shared across sessions, e.g. with `st.cache_resource`. Rules should be defined identically across reruns.
+
+    Examples
+    --------
+    >>> import streamlit_survey as ss
+    >>>
+    >>> rules = ss.RuleEngine()
+    >>> rules.show_if("Q1_1", {"Q1": "👍"})
+    >>> rules.add_rule("Q2", ["Q1", "Q1_1"], lambda q1, q1_1: q1 == "👍" and len(q1_1) > 10)
+    >>>
+    >>> survey = ss.StreamlitSurvey("My Survey", rules=rules)
+    >>> survey.radio("Thumbs up/down:", options=["NA", "👍", "👎"], id="Q1")
+    >>> if survey.rules.is_reachable("Q1_1"):
+    >>>     survey.text_input("Why did you select '👍'?", id="Q1_1")
+    """
+
+    def __init__(self):
+        self.rules: Dict[str, Rule] = {}
+        self.dependents: Dict[str, Set[str]] = {}  # Question ID -> IDs of the questions whose rules depend on it
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.rules
+
+    def add_rule(self, id: str, depends_on: Iterable[str], predicate: Callable[..., bool]):
+        """
+        Add a display rule for a question
+
+        Parameters
+        ----------
+        id: str
+            ID of the question to show or hide
+        depends_on: Iterable[str]
+            IDs of the questions the rule depends on
+        predicate: Callable
+            Function called with the current values of the `depends_on` questions, returning whether the question is shown
+
+        Raises
+        ------
+        ValueError:
+            If the question already has a rule, or if the rule would create a dependency cycle
+        """
+        depends_on = tuple(depends_on)
+        if id in self.rules:
+            raise ValueError(f"Question {id!r} already has a rule.")
+        for dependency in depends_on:
+            if dependency == id or id in self._ancestors(dependency):
+                raise ValueError(f"Rule for question {id!r} depending on {dependency!r} creates a dependency cycle.")
+
+        self.rules[id] = Rule(depends_on, predicate)
+        for dependency in depends_on:
+            self.dependents.setdefault(dependency, set()).add(id)
+
+    def show_if(self, id: str, condition: Mapping[str, Any]):
+        """
+        Show a question only if other questions have the given values
+
+        Parameters
+        ----------
+        id: str
+            ID of the question to show or hide
+        condition: dict
+            Dictionary mapping question IDs to the accepted value, or to a list of accepted values
+        """
+        depends_on = tuple(condition)
+        accepted = tuple(
+            tuple(values) if isinstance(values, (list, tuple)) else (values,) for values in condition.values()
+        )
+
+        def predicate(*values):
+            return all(value in accepted_values for value, accepted_values in zip(values, accepted))
+
+        self.add_rule(id, depends_on, predicate)
+
+    def _ancestors(self, id: str) -> Set[str]:
+        ancestors = set()
+        stack = [id]
+        while stack:
+            rule = self.rules.get(stack.pop())
+            if rule is not None:
+                for dependency in rule.depends_on:
+                    if dependency not in ancestors:
+                        ancestors.add(dependency)
+                        stack.append(dependency)
+        return ancestors
+
+    def descendants(self, ids: Iterable[str]) -> Set[str]:
+        """
+        IDs of the questions whose reachability depends, directly or transitively, on the given questions.
+        """
+        descendants = set()
+        stack = [id for id in ids if id in self.dependents]
+        while stack:
+            for dependent in self.dependents.get(stack.pop(), ()):
+                if dependent not in descendants:
+                    descendants.add(dependent)
+                    stack.append(dependent)
+        return descendants
+
+
+class BoundRules(object):
+    """
+    Rule engine bound to a survey, with reachability cached in the survey's session state.
+    """
+
+    def __init__(self, engine: RuleEngine, survey, cache: Dict[str, bool]):
+        """
+        Parameters
+        ----------
+        engine: RuleEngine
+            Rule engine
+        survey: StreamlitSurvey
+            Survey object
+        cache: dict
+            Dictionary caching the reachability of questions, persisted across reruns
+        """
+        self.engine = engine
+        self.survey = survey
+        self._cache = cache
+
+    def invalidate(self, ids: Iterable[str]):
+        """
+        Invalidate cached reachability of the questions depending on the given questions, after their answers changed.
+        """
+        for id in self.engine.descendants(ids):
+            self._cache.pop(id, None)
+
+    def invalidate_all(self):
+        self._cache.clear()
+
+    def is_reachable(self, id: str) -> bool:
+        """
+        Whether a question is reachable given the survey's current answers. Only rules invalidated by answer changes since the last call are re-evaluated.
+        """
+        if id in self._cache:
+            return self._cache[id]
+        rule = self.engine.rules.get(id)
+        if rule is None:
+            return True
+
+        reachable = all(self.is_reachable(dependency) for dependency in rule.depends_on) and bool(
+            rule.predicate(*(self.survey._get(dependency, "value") for dependency in rule.depends_on))
+        )
+        self._cache[id] = reachable
+        return reachable
+
+    def unreachable_ids(self) -> List[str]:
+        """
+        IDs of unreachable questions that have answers. Only questions with rules are checked, rather than all survey data.
+        """
+        return [
+            id
+            for id in self.engine.rules
+            if id in self.survey.data and self.survey.data[id].get("value") is not None and not self.is_reachable(id)
+        ]
+
+    def prune(self, clear: bool = False) -> List[str]:
+        """
+        Mark or clear answers to unreachable questions
+
+        Parameters
+        ----------
+        clear: bool
+            If True, answers to unreachable questions are cleared. Otherwise, they are kept and their "reachable" field is set to False. Default is False.
+
+        Returns
+        -------
+        list
+            IDs of the unreachable questions
+        """
+        for id in self.engine.rules:
+            if id not in self.survey.data:
+                continue
+            reachable = self.is_reachable(id)
+            if clear and not reachable:
+                self.survey._log(id, "value", None)
+            elif not clear:
+                if reachable and "reachable" not in self.survey.data[id]:
+                    continue
+                self.survey._log(id, "reachable", reachable)
+        return self.unreachable_ids()
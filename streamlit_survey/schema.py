@@ -0,0 +1,265 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+import streamlit as st
+
+from streamlit_survey.rules import RuleEngine
+from streamlit_survey.survey_component import (
+    CheckBox,
+    DateInput,
+    MultiSelect,
+    NumberInput,
+    Radio,
+    SelectBox,
+    SelectSlider,
+    Slider,
+    TextArea,
+    TextInput,
+    TimeInput,
+)
+
+PathLike = Union[str, os.PathLike]
+
+COMPONENT_TYPES = {
+    "text_input": TextInput,
+    "text_area": TextArea,
+    "number_input": NumberInput,
+    "multiselect": MultiSelect,
+    "selectbox": SelectBox,
+    "radio": Radio,
+    "slider": Slider,
+    "select_slider": SelectSlider,
+    "checkbox": CheckBox,
+    "dateinput": DateInput,
+    "timeinput": TimeInput,
+}
+
+_RESERVED_KEYS = ("id", "type", "label", "page", "when")
+
+
+class QuestionPlan(NamedTuple):
+    """
+    Compiled survey question.
+    """
+
+    id: str
+    component: type
+    label: str
+    kwargs: Mapping[str, Any]  # Read-only keyword arguments passed to the Streamlit input widget
+    page: Optional[int]
+    condition: Tuple[Tuple[str, Tuple[Any, ...]], ...]  # (question ID, accepted values) pairs
+
+    def is_shown(self, survey) -> bool:
+        """
+        Whether the question's display condition holds given the survey's current answers.
+        """
+        return all(survey._get(id, "value") in values for id, values in self.condition)
+
+
+class SurveyPlan(object):
+    """
+    Immutable survey plan compiled from a declarative survey schema.
+
+    Plans are compiled once and can be shared by all sessions (see `load_plan()`). Rendering a plan only walks the questions of the displayed page and evaluates their display conditions. Display conditions are also compiled into a rule engine (`plan.rules`). When it is passed to the survey, conditions are only re-evaluated when the answers they depend on change, and questions are only shown if the questions they depend on are shown as well.
+
+    Examples
+    --------
+    >>> import streamlit_survey as ss
+    >>> from streamlit_survey.schema import load_plan
+    >>>
+    >>> plan = load_plan({
+    >>>     "questions": [
+    >>>         {"id": "Q1", "type": "radio", "label": "Thumbs up/down:", "options": ["NA", "👍", "👎"]},
+    >>>         {"id": "Q1_1", "type": "text_input", "label": "Why did you select '👍'?", "when": {"Q1": "👍"}},
+    >>>     ]
+    >>> })
+    >>> survey = ss.StreamlitSurvey("My Survey", rules=plan.rules)
+    >>> answers = plan.render(survey)
+    """
+
+    def __init__(self, questions: Tuple[QuestionPlan, ...]):
+        """
+        Parameters
+        ----------
+        questions: tuple
+            Compiled survey questions, in display order
+        """
+        pages = {}
+        for question in questions:
+            pages.setdefault(question.page, []).append(question)
+
+        self._questions = tuple(questions)
+        self._by_id = MappingProxyType({question.id: question for question in questions})
+        self._pages = MappingProxyType({page: tuple(page_questions) for page, page_questions in pages.items()})
+        self._rules = RuleEngine()
+        for question in questions:
+            if question.condition:
+                self._rules.show_if(question.id, dict(question.condition))
+
+    @property
+    def questions(self) -> Tuple[QuestionPlan, ...]:
+        return self._questions
+
+    @property
+    def rules(self) -> RuleEngine:
+        return self._rules
+
+    @property
+    def by_id(self) -> Mapping[str, QuestionPlan]:
+        return self._by_id
+
+    @property
+    def n_pages(self) -> int:
+        """
+        Number of pages, based on the largest page index of the survey questions.
+        """
+        return 1 + max((page for page in self._pages if page is not None), default=0)
+
+    def page(self, page: Optional[int]) -> Tuple[QuestionPlan, ...]:
+        """
+        Questions of the given page. Questions without a page are returned for `page=None`.
+        """
+        return self._pages.get(page, ())
+
+    def render(self, survey, page: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Display the questions of a page whose display conditions hold
+
+        Parameters
+        ----------
+        survey: StreamlitSurvey
+            Survey object
+        page: int
+            Page to display. If None, all questions are displayed.
+
+        Returns
+        -------
+        dict
+            Values of the displayed questions, by question ID
+        """
+        questions = self._questions if page is None else self.page(page)
+        rules = survey.rules if survey.rules is not None and survey.rules.engine is self._rules else None
+        values = {}
+        for question in questions:
+            if rules.is_reachable(question.id) if rules is not None else question.is_shown(survey):
+                values[question.id] = question.component(
+                    survey, question.label, question.id, **question.kwargs
+                ).display()
+        return values
+
+
+def _compile_condition(when: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, Tuple[Any, ...]], ...]:
+    if when is None:
+        return ()
+    if not isinstance(when, Mapping):
+        raise ValueError(f"Question conditions should map question IDs to values, not {when!r}.")
+    condition = []
+    for id, values in when.items():
+        # A list of accepted values, or a single accepted value.
+        values = tuple(values) if isinstance(values, (list, tuple)) else (values,)
+        condition.append((id, values))
+    return tuple(condition)
+
+
+def compile_schema(schema: Mapping[str, Any]) -> SurveyPlan:
+    """
+    Compile a declarative survey schema into an immutable survey plan
+
+    The schema contains a list of questions. Each question has an "id", a component "type" (e.g. "text_input", "radio" or "multiselect", see `COMPONENT_TYPES`) and a "label". It may also have a "page" index and a "when" condition mapping the IDs of previous questions to the accepted value (or list of accepted values). Other question fields are passed to the Streamlit input widget.
+
+    Parameters
+    ----------
+    schema: dict
+        Survey schema
+
+    Returns
+    -------
+    SurveyPlan
+        Compiled survey plan
+
+    Raises
+    ------
+    ValueError:
+        If the schema is invalid
+    """
+    questions = []
+    seen = set()
+    for spec in schema.get("questions", ()):
+        if "id" not in spec:
+            raise ValueError(f"Question {spec!r} has no ID.")
+        id = spec["id"]
+        if id in seen:
+            raise ValueError(f"Duplicate question ID {id!r}.")
+        type = spec.get("type", "text_input")
+        if type not in COMPONENT_TYPES:
+            raise ValueError(f"Unknown type {type!r} for question {id!r}. Expected one of {tuple(COMPONENT_TYPES)}.")
+        condition = _compile_condition(spec.get("when"))
+        for dependency, _ in condition:
+            if dependency not in seen:
+                raise ValueError(f"Question {id!r} depends on {dependency!r}, which is not a previous question.")
+
+        kwargs = {key: value for key, value in spec.items() if key not in _RESERVED_KEYS}
+        questions.append(
+            QuestionPlan(
+                id=id,
+                component=COMPONENT_TYPES[type],
+                label=spec.get("label", ""),
+                kwargs=MappingProxyType(kwargs),
+                page=spec.get("page"),
+                condition=condition,
+            )
+        )
+        seen.add(id)
+    return SurveyPlan(tuple(questions))
+
+
+def read_schema(path: PathLike) -> Dict[str, Any]:
+    """
+    Read a survey schema from a JSON or YAML file. Reading YAML files requires PyYAML to be installed.
+    """
+    with open(path, "r") as f:
+        if os.fspath(path).endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("Reading YAML schemas requires PyYAML. Install it with `pip install pyyaml`.") from e
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner=False)
+def load_plan(schema: Union[PathLike, Dict[str, Any]]) -> SurveyPlan:
+    """
+    Compile a survey schema, caching the resulting plan across reruns and sessions
+
+    Parameters
+    ----------
+    schema: Union[str, dict]
+        Survey schema, or path to a JSON or YAML file containing the schema
+
+    Returns
+    -------
+    SurveyPlan
+        Compiled survey plan, shared by all sessions
+    """
+    if not isinstance(schema, Mapping):
+        schema = read_schema(schema)
+    return compile_schema(schema)
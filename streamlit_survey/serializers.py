@@ -0,0 +1,195 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import bz2
+import datetime
+import gzip
+import json
+import lzma
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from streamlit_survey.question_record import QuestionRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def encode_value(obj: Any) -> Any:
+    """
+    Encoder hook for survey data values that are not natively supported by serializers. Survey records and read-only mappings are encoded as dictionaries and dates and times as ISO 8601 strings.
+    """
+    if isinstance(obj, QuestionRecord):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class Serializer(ABC):
+    """
+    Serialization format for survey data.
+    """
+
+    @abstractmethod
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        """
+        Serialize survey data.
+
+        Parameters
+        ----------
+        data: dict
+            Dictionary mapping question IDs to survey records
+
+        Returns
+        -------
+        bytes
+            Serialized survey data
+        """
+        pass
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Dict[str, Dict[str, Any]]:
+        """
+        Deserialize survey data.
+
+        Parameters
+        ----------
+        payload: bytes
+            Serialized survey data
+
+        Returns
+        -------
+        dict
+            Dictionary mapping question IDs to dictionaries of question fields
+        """
+        pass
+
+
+class JSONSerializer(Serializer):
+    """
+    JSON serialization. Uses orjson when it is installed, and the standard library's `json` module otherwise.
+    """
+
+    def dumps(self, data):
+        if orjson is not None:
+            return orjson.dumps(data, default=encode_value)
+        return json.dumps(data, default=encode_value).encode("utf-8")
+
+    def loads(self, payload):
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+
+
+class MsgpackSerializer(Serializer):
+    """
+    MessagePack serialization. Values are encoded like JSON (see `encode_value()`), so that survey data round-trips identically in both formats. Requires msgpack to be installed.
+    """
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The msgpack format requires msgpack. Install it with `pip install msgpack`.")
+
+    def dumps(self, data):
+        return msgpack.packb(data, default=encode_value, use_bin_type=True)
+
+    def loads(self, payload):
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+SERIALIZERS: Dict[str, Callable[[], Serializer]] = {
+    "json": JSONSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+COMPRESSIONS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "gzip": (gzip.compress, gzip.decompress),
+    "zlib": (zlib.compress, zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+def _get_serializer(format: str) -> Serializer:
+    if format not in SERIALIZERS:
+        raise ValueError(f"Unknown serialization format {format!r}. Expected one of {tuple(SERIALIZERS)}.")
+    return SERIALIZERS[format]()
+
+
+def _get_compression(compression: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}. Expected one of {tuple(COMPRESSIONS)}.")
+    return COMPRESSIONS[compression]
+
+
+def dumps(data: Dict[str, Any], format: str = "json", compression: Optional[str] = None) -> bytes:
+    """
+    Serialize survey data
+
+    Parameters
+    ----------
+    data: dict
+        Dictionary mapping question IDs to survey records
+    format: str
+        Serialization format. One of "json" or "msgpack", or any format added to `SERIALIZERS`.
+    compression: str
+        Optional compression. One of "gzip", "zlib", "bz2" or "lzma".
+
+    Returns
+    -------
+    bytes
+        Serialized survey data
+    """
+    payload = _get_serializer(format).dumps(data)
+    if compression is not None:
+        compress, _ = _get_compression(compression)
+        payload = compress(payload)
+    return payload
+
+
+def loads(payload: bytes, format: str = "json", compression: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Deserialize survey data
+
+    Parameters
+    ----------
+    payload: bytes
+        Serialized survey data
+    format: str
+        Serialization format. One of "json" or "msgpack", or any format added to `SERIALIZERS`.
+    compression: str
+        Optional compression. One of "gzip", "zlib", "bz2" or "lzma".
+
+    Returns
+    -------
+    dict
+        Dictionary mapping question IDs to dictionaries of question fields
+    """
+    if compression is not None:
+        _, decompress = _get_compression(compression)
+        payload = decompress(payload)
+    return _get_serializer(format).loads(payload)
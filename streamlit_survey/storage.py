@@ -0,0 +1,312 @@
+"""
+Copyright 2023 Olivier Binette
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+PathLike = Union[str, bytes, os.PathLike]
+
+
+class SurveyStorage(ABC):
+    """
+    Persistent storage backend for survey data.
+
+    Survey answers are written through to the storage backend one field at a time, so that each answer change results in a single small write. Survey data is loaded back from the storage backend when a new session starts.
+
+    Examples
+    --------
+    >>> import streamlit_survey as ss
+    >>> from streamlit_survey.storage import SQLiteStorage
+    >>>
+    >>> survey = ss.StreamlitSurvey("My Survey", storage=SQLiteStorage("answers.db", namespace="respondent-1"))
+    """
+
+    @abstractmethod
+    def load(self) -> Dict[str, Dict[Hashable, Any]]:
+        """
+        Load all stored survey data.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping question IDs to dictionaries of question fields
+        """
+        pass
+
+    @abstractmethod
+    def write(self, id: str, key: Hashable, value: Any):
+        """
+        Write a single question field.
+
+        Parameters
+        ----------
+        id: str
+            Question ID
+        key: Hashable
+            Field name (e.g. "value", "label" or "widget_key")
+        value: Any
+            JSON-serializable field value
+        """
+        pass
+
+    def delete(self, id: str, key: Hashable):
+        """
+        Delete a single question field. Backends that cannot delete fields store None instead, which reads the same as a missing field.
+
+        Parameters
+        ----------
+        id: str
+            Question ID
+        key: Hashable
+            Field name
+        """
+        self.write(id, key, None)
+
+    @abstractmethod
+    def clear(self):
+        """
+        Delete all stored survey data.
+        """
+        pass
+
+    def replace(self, data: Dict[str, Dict[Hashable, Any]]):
+        """
+        Replace all stored survey data.
+
+        Parameters
+        ----------
+        data: dict
+            Dictionary mapping question IDs to dictionaries of question fields
+        """
+        self.clear()
+        for id, fields in data.items():
+            for key, value in fields.items():
+                self.write(id, key, value)
+
+    def close(self):
+        """
+        Release resources held by the storage backend.
+        """
+        pass
+
+
+class MemoryStorage(SurveyStorage):
+    """
+    In-memory storage backend. Data is shared by all surveys using the same storage object, but it is not persisted across server restarts.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            return {id: dict(fields) for id, fields in self._data.items()}
+
+    def write(self, id, key, value):
+        with self._lock:
+            self._data.setdefault(id, {})[key] = value
+
+    def delete(self, id, key):
+        with self._lock:
+            self._data.get(id, {}).pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteStorage(SurveyStorage):
+    """
+    SQLite storage backend. Each question field is stored as a row, so that answer changes are single-row upserts.
+    """
+
+    def __init__(self, path: PathLike, namespace: str = "", table: str = "streamlit_survey"):
+        """
+        Parameters
+        ----------
+        path: str
+            Path to the SQLite database file
+        namespace: str
+            Namespace under which survey data is stored (e.g. a respondent identifier). Allows several surveys to share a database file.
+        table: str
+            Name of the database table
+        """
+        self.namespace = namespace
+        self.table = table
+        self._lock = threading.Lock()
+        # Streamlit runs scripts on a different thread for each session, hence the connection is shared across threads and guarded by a lock.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" '
+                "(namespace TEXT, id TEXT, key TEXT, value TEXT, PRIMARY KEY (namespace, id, key))"
+            )
+
+    def load(self):
+        with self._lock:
+            rows = self._connection.execute(
+                f'SELECT id, key, value FROM "{self.table}" WHERE namespace = ?', (self.namespace,)
+            ).fetchall()
+        data = {}
+        for id, key, value in rows:
+            data.setdefault(id, {})[key] = json.loads(value)
+        return data
+
+    def write(self, id, key, value):
+        with self._lock, self._connection:
+            self._connection.execute(
+                f'INSERT OR REPLACE INTO "{self.table}" (namespace, id, key, value) VALUES (?, ?, ?, ?)',
+                (self.namespace, id, key, json.dumps(value)),
+            )
+
+    def delete(self, id, key):
+        with self._lock, self._connection:
+            self._connection.execute(
+                f'DELETE FROM "{self.table}" WHERE namespace = ? AND id = ? AND key = ?', (self.namespace, id, key)
+            )
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute(f'DELETE FROM "{self.table}" WHERE namespace = ?', (self.namespace,))
+
+    def replace(self, data):
+        rows = [
+            (self.namespace, id, key, json.dumps(value)) for id, fields in data.items() for key, value in fields.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.execute(f'DELETE FROM "{self.table}" WHERE namespace = ?', (self.namespace,))
+            self._connection.executemany(
+                f'INSERT OR REPLACE INTO "{self.table}" (namespace, id, key, value) VALUES (?, ?, ?, ?)', rows
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class AppendOnlyFileStorage(SurveyStorage):
+    """
+    Append-only file storage backend (write-ahead journal).
+
+    Each answer change is appended to the journal file as a compact JSON record `[id, key, value, timestamp]`, and each deleted field as a record `[id, key]`. Compaction folds the journal into a snapshot file, which is written atomically before the journal is truncated. Survey data is rebuilt by replaying the journal on top of the snapshot. A record left incomplete by a crash is ignored on replay.
+    """
+
+    def __init__(
+        self, path: PathLike, snapshot_path: Optional[PathLike] = None, compact_every: Optional[int] = None, fsync=False
+    ):
+        """
+        Parameters
+        ----------
+        path: str
+            Path to the journal file
+        snapshot_path: str
+            Path to the snapshot file. Defaults to the journal path with a ".snapshot" suffix.
+        compact_every: int
+            Number of journal records after which the journal is automatically compacted. If None, the journal is only compacted when `compact()` is called.
+        fsync: bool
+            Whether to force journal records to disk after each write. Default is False.
+        """
+        self.path = os.fspath(path)
+        self.snapshot_path = self.path + ".snapshot" if snapshot_path is None else os.fspath(snapshot_path)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._n_records = None  # Number of journal records, counted on first load
+
+    def _append(self, records: List[Optional[list]]):
+        with self._lock:
+            if self._n_records is None:
+                # Count existing records and repair an interrupted last record before appending to the journal.
+                self._replay()
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._n_records += len(records)
+            if self.compact_every is not None and self._n_records >= self.compact_every:
+                self.compact()
+
+    def _replay(self):
+        data = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                data = json.load(f)
+        n_records = 0
+        if os.path.exists(self.path):
+            valid_size = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Record was interrupted while being written.
+                        break
+                    valid_size += len(line)
+                    n_records += 1
+                    record = json.loads(line)
+                    if record is None:
+                        # A null record marks the point where all previous data was cleared.
+                        data.clear()
+                    elif len(record) == 2:
+                        id, key = record
+                        data.get(id, {}).pop(key, None)
+                    else:
+                        id, key, value = record[:3]
+                        data.setdefault(id, {})[key] = value
+            if os.path.getsize(self.path) > valid_size:
+                os.truncate(self.path, valid_size)
+        self._n_records = n_records
+        return data
+
+    def load(self):
+        with self._lock:
+            return self._replay()
+
+    def write(self, id, key, value):
+        self._append([[id, key, value, time.time()]])
+
+    def delete(self, id, key):
+        self._append([[id, key]])
+
+    def clear(self):
+        self._append([None])
+
+    def replace(self, data):
+        timestamp = time.time()
+        records = [None]
+        records.extend([id, key, value, timestamp] for id, fields in data.items() for key, value in fields.items())
+        self._append(records)
+
+    def compact(self):
+        """
+        Fold the journal into the snapshot file and truncate the journal.
+        """
+        with self._lock:
+            data = self._replay()
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Replaying the old journal on top of the new snapshot yields the same data, so a crash before truncation is harmless.
+            open(self.path, "w").close()
+            self._n_records = 0
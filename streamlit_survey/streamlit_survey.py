@@ -14,15 +14,37 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import datetime
 import json
 import os
-from collections import defaultdict
-from typing import Any, Hashable, List, Optional, Union
+import time
+import uuid
+from concurrent.futures import Future
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
 
 import streamlit as st
-
-from streamlit_survey.pages import Pages
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from streamlit_survey import serializers
+from streamlit_survey.autosave import Autosaver
+from streamlit_survey.collector import ResponseCollector
+from streamlit_survey.file_io import (
+    get_executor,
+    is_url,
+    open_json,
+    parse_json_records,
+    read_json_records,
+    write_text,
+    write_text_nowait,
+)
+from streamlit_survey.instrumentation import SurveyStats
+from streamlit_survey.layered_data import LayeredData
+from streamlit_survey.pages import PageIndex, Pages
+from streamlit_survey.question_record import QuestionRecord, encode_record
+from streamlit_survey.rules import BoundRules, RuleEngine
+from streamlit_survey.storage import SurveyStorage
 from streamlit_survey.survey_component import (
     CheckBox,
     DateInput,
@@ -41,6 +63,39 @@ from streamlit_survey.survey_component import (
 PathLike = Union[str, bytes, os.PathLike]
 
 
+class _ExportCache(object):
+    """
+    Export payloads cached in the session state. Payloads are only valid for the survey data object they were computed from, since surveys with the same label can wrap different data.
+    """
+
+    def __init__(self, data: Mapping):
+        self.data = data
+        self.base = getattr(data, "base", None)  # Shared base of copy-on-write survey data
+        self.payloads: Dict[Tuple[str, Optional[str]], Union[str, bytes]] = {}
+
+    def is_valid(self, data: Mapping) -> bool:
+        return data is self.data and getattr(data, "base", None) is self.base
+
+    def __getstate__(self):
+        # Survey data is not pickled along with cached payloads, which are recomputed instead.
+        return {}
+
+    def __setstate__(self, state):
+        self.data = self.base = None
+        self.payloads = {}
+
+
+_pending_imports: Dict[str, Future] = {}  # Imports started by `from_json_nowait()`, by key
+
+
+def _script_run_token() -> Any:
+    """
+    Return an object identifying the current Streamlit script run, or None outside of script runs. Streamlit recreates the run context's cursors mapping at the start of every script run.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return None if ctx is None else ctx.cursors
+
+
 class StreamlitSurvey:
     """
     StreamlitSurvey is a Streamlit component that allows you to create surveys. It is built on top of the Streamlit API and allows you to create surveys with a few lines of code.
@@ -100,8 +155,21 @@ class StreamlitSurvey:
     """
 
     BASE_NAME = "__streamlit-survey-data"
-
-    def __init__(self, label: str = "", data: dict = None, auto_id: bool = True):
+    MERGE_POLICIES = ("overwrite", "keep", "latest")
+
+    def __init__(
+        self,
+        label: str = "",
+        data: dict = None,
+        auto_id: bool = True,
+        storage: Optional[SurveyStorage] = None,
+        stats: Union[bool, SurveyStats] = False,
+        rules: Optional[RuleEngine] = None,
+        autosave: Union[None, PathLike, SurveyStorage, Autosaver] = None,
+        read_only: bool = False,
+        base: Optional[Mapping[str, Mapping[Hashable, Any]]] = None,
+        timestamps: bool = False,
+    ):
         """
         Parameters
         ----------
@@ -111,33 +179,198 @@ class StreamlitSurvey:
             Dictionary containing survey questions and answers
         auto_id: bool
             Whether to automatically number survey questions
+        storage: SurveyStorage
+            Optional storage backend to which answer changes are written through. Survey data is loaded from the storage backend when the session starts.
+        stats: Union[bool, SurveyStats]
+            Whether to collect instrumentation counters, available as `survey.stats`. Can also be a `SurveyStats` object, e.g. with a callback. Default is False.
+        rules: RuleEngine
+            Optional show/hide rules for survey questions. Question reachability is then available through `survey.rules` and cached in the session state across reruns.
+        autosave: Union[str, SurveyStorage, Autosaver]
+            Optional path or storage backend to which survey data is saved in the background after answer changes, or `Autosaver` object with custom flush thresholds. The autosaver is created once per session and kept in the session state, and each session should save to its own path.
+        read_only: bool
+            Whether the survey is a read-only view of its data, e.g. of shared data loaded with `streamlit_survey.data_cache.load_survey_data()`. Components are displayed disabled, showing the survey data, and changing answers programmatically or importing data raises a ValueError. Default is False.
+        base: Mapping
+            Optional shared read-only survey data, such as prefilled answers or a previous wave's answers. The session's survey data is then a copy-on-write layer on top of `base` (see `LayeredData`): only the questions changed in the session are stored in its session state, and `base` is never modified. The base is not pickled with the session state, and should be passed on every script run.
+        timestamps: bool
+            Whether to record the time of the last change of each question in its "timestamp" field, which is exported and written to the storage backend along with answers. Required for merge imports with the "latest" policy (see `from_file()`). Default is False.
         """
         self.data_name = self.BASE_NAME + "_" + label
         if data is None:
             if self.data_name not in st.session_state:
-                st.session_state[self.data_name] = {}
+                st.session_state[self.data_name] = {} if base is None else LayeredData(base)
+                if storage is not None:
+                    st.session_state[self.data_name].update(
+                        (id, QuestionRecord(fields)) for id, fields in storage.load().items()
+                    )
             data = st.session_state[self.data_name]
+            if base is not None and isinstance(data, LayeredData):
+                data.rebase(base)
 
         self.label = label
+        self.read_only = read_only
         self.auto_id = auto_id
+        self.timestamps = timestamps
         self.data = data
-
-        self._components = []  # Active (currently displayed) survey components
+        self._layered = isinstance(data, LayeredData)
+        self.storage = storage
+        self.stats = SurveyStats() if stats is True else (stats or None)
+        self.export_name = self.data_name + "_export"  # Cached export payloads, cleared when survey data changes
+        self.rules = None
+        if rules is not None:
+            rules_name = self.data_name + "_rules"
+            if rules_name not in st.session_state:
+                st.session_state[rules_name] = {}
+            self.rules = BoundRules(rules, self, st.session_state[rules_name])
+
+        self.autosave = None
+        if autosave is not None:
+            autosave_name = self.data_name + "_autosave"
+            if autosave_name not in st.session_state:
+                st.session_state[autosave_name] = autosave if isinstance(autosave, Autosaver) else Autosaver(autosave)
+            self.autosave = st.session_state[autosave_name]
+            self.autosave.bind(self.data)
+
+        page_index_name = self.data_name + "_page_index"
+        if page_index_name not in st.session_state:
+            st.session_state[page_index_name] = PageIndex()
+        self.page_index = st.session_state[page_index_name]  # Questions displayed on each page, and answered pages
+
+        self.changed_ids = set()  # IDs of questions whose data changed during the current rerun
+        self._components = {}  # Survey components registered during the current rerun, by ID
+        self._displayed_ids = set()  # IDs of survey components displayed during the current rerun
+        self._active_page = None  # (Page group key, page index) of the pages being displayed
+        self._run_token = _script_run_token()
+        self._components_token = self._run_token
+
+        self.pending_import_name = self.data_name + "_pending_import"  # Import started by `from_json_nowait()`
+        self._apply_pending_import()
+
+    def _sync_run(self):
+        """
+        Reset per-rerun state when the survey object is reused across script runs (e.g. when it is cached).
+        """
+        token = _script_run_token()
+        if token is not self._run_token:
+            self._run_token = token
+            self.changed_ids = set()
+            if self.stats is not None:
+                self.stats.reset()
 
     def _add_component(self, component: SurveyComponent):
-        self._components.append(component)
+        self._sync_run()
+        if self._components_token is not self._run_token:
+            # The registry is only cleared when the first component of a new run is registered, so that callbacks running before the script (such as `importer()`) still see the components displayed by the previous run.
+            self._components_token = self._run_token
+            self._components = {}
+            self._displayed_ids = set()
+        self._components[component.id] = component
+        if self._active_page is not None:
+            record = self.data.get(component.id)
+            value = None if record is None else record.get("value")
+            self.page_index.assign(component.id, *self._active_page, value=value, required=component.required)
+        if self.stats is not None:
+            self.stats.on_component(component)
+
+    def _mark_displayed(self, component: SurveyComponent):
+        self._displayed_ids.add(component.id)
+
+    @property
+    def components(self) -> Mapping[str, SurveyComponent]:
+        """
+        Survey components registered during the current rerun, by question ID.
+        """
+        return MappingProxyType(self._components)
 
-    def _log(self, id: str, key: Hashable, value: Any):
-        if id not in self.data:
-            self.data[id] = defaultdict(lambda: None)
+    @property
+    def displayed_ids(self) -> FrozenSet[str]:
+        """
+        IDs of the questions displayed during the current rerun.
+        """
+        return frozenset(self._displayed_ids)
 
-        self.data[id][key] = value
+    def _log(self, id: str, key: Hashable, value: Any):
+        record = self.data.get(id)
+        first = record is None or key not in record
+        if not first and record[key] == value:
+            # Skip unchanged values, which are logged again on every rerun.
+            return
+        if self.read_only:
+            if first or key in ("label", "widget_key"):
+                # Read-only views display disabled components without recording their labels, widget keys and widgets' initial values. Other writes are programming errors.
+                return
+            raise ValueError(f"Survey {self.label!r} is read-only.")
+
+        if record is None:
+            record = self.data[id] = QuestionRecord()
+        elif self._layered:
+            # Copy-on-write of records from the shared base.
+            record = self.data.writable(id)
+
+        record[key] = value
+        if self.timestamps:
+            record["timestamp"] = time.time()
+        self._sync_run()
+        self.changed_ids.add(id)
+        self._invalidate_export()
+        if key == "value":
+            # The first value logged for a question is its widget's initial value.
+            self.page_index.set_value(id, value, default=first)
+            if self.rules is not None:
+                self.rules.invalidate((id,))
+        if self.storage is not None:
+            self.storage.write(id, key, value)
+            if self.timestamps:
+                self.storage.write(id, "timestamp", record["timestamp"])
+        if self.autosave is not None:
+            self.autosave.notify(id, record)
+        if self.stats is not None:
+            self.stats.on_log(id, key, value)
 
     def _get(self, id: str, key: Hashable):
-        if id not in self.data:
-            self.data[id] = defaultdict(lambda: None)
+        # Reads never insert records, so that querying unanswered questions does not grow survey data.
+        record = self.data.get(id)
+        return None if record is None else record.get(key)
 
-        return self.data[id][key]
+    def get_many(self, ids: Iterable[str], key: Hashable = "value") -> Dict[str, Any]:
+        """
+        Get a field of many questions at once, without modifying survey data
+
+        Parameters
+        ----------
+        ids: Iterable[str]
+            Question IDs
+        key: str
+            Field to get. Default is "value".
+
+        Returns
+        -------
+        dict
+            Field values by question ID. Values of unknown questions are None.
+        """
+        get = self.data.get
+        values = {}
+        for id in ids:
+            record = get(id)
+            values[id] = None if record is None else record.get(key)
+        return values
+
+    def _invalidate_export(self):
+        st.session_state.pop(self.export_name, None)
+
+    def _cached_export(self, format: str = "json", compression: Optional[str] = None) -> Union[str, bytes]:
+        """
+        Return the export of the survey data, reusing the payload from a previous rerun if no answer changed since.
+        """
+        cache = st.session_state.get(self.export_name)
+        if cache is None or not cache.is_valid(self.data):
+            cache = st.session_state[self.export_name] = _ExportCache(self.data)
+        payloads = cache.payloads
+        if (format, compression) not in payloads:
+            if format == "json" and compression is None:
+                payloads[format, compression] = self.to_json()
+            else:
+                payloads[format, compression] = self.to_bytes(format, compression)
+        return payloads[format, compression]
 
     def _create_id(self, label: str):
         if self.auto_id:
@@ -145,7 +378,16 @@ class StreamlitSurvey:
         else:
             raise RuntimeError("An ID should be explicitely provided if `auto_id` is set to False.")
 
-    def pages(self, index: Union[int, list], on_submit=None, progress_bar=False, label: str = ""):
+    def pages(
+        self,
+        index: Union[int, list],
+        on_submit=None,
+        progress_bar=False,
+        label: str = "",
+        prefetch: Optional[Callable[[int], Any]] = None,
+        jump: bool = False,
+        page_of: Optional[Callable[[str], Optional[int]]] = None,
+    ):
         """
         Create a pages group
 
@@ -161,23 +403,48 @@ class StreamlitSurvey:
         >>>     elif pages.current == 2:
         >>>         st.write("Thank you!")
 
+        Pages can also be given as a list of functions, so that only the current page's function is run:
+
+        >>> def name_page():
+        >>>     survey.text_input("What is your name?")
+        >>>
+        >>> def age_page():
+        >>>     survey.number_input("What is your age?")
+        >>>
+        >>> survey.pages([name_page, age_page]).run()
+
         Parameters
         ----------
-        index: Union[int, list]
-            Number of pages or list of page names
+        index: Union[int, range, list]
+            Number of pages, range or list of page names, or list of page functions
         on_submit: function
             Function to call when the user submits the survey.
         progress_bar: bool
             Whether to show a progress bar under the pages group. Default to False.
         label: str
             Label for the page group.
+        prefetch: Callable
+            Optional function called with the index of the next page once the current page is displayed, e.g. a cached function precomputing the next page's data.
+        jump: bool
+            Whether to show a page number input and a "Next unanswered" button under the pages group. Default to False.
+        page_of: Callable
+            Optional function returning the index of the page displaying a question, given its ID, or None if the question is not in the pages group. Imported answers and answers loaded from storage are then indexed by page before their page is displayed, e.g. so that "Next unanswered" skips their pages.
 
         Returns
         -------
         Pages
             Pages object
         """
-        return Pages(index, key=self.data_name + "_Pages_" + label, on_submit=on_submit, progress_bar=progress_bar)
+        return Pages(
+            index,
+            key=self.data_name + "_Pages_" + label,
+            on_submit=on_submit,
+            progress_bar=progress_bar,
+            prefetch=prefetch,
+            jump=jump,
+            survey=self,
+            page_of=page_of,
+        )
 
     def to_json(self, path: Optional[PathLike] = None) -> Optional[str]:
         """
@@ -193,13 +460,140 @@ class StreamlitSurvey:
         str
             JSON string containing survey data. Only returned if `path` is None.
         """
+        start = time.perf_counter()
+        payload = json.dumps(self.data, default=encode_record)
+        if self.stats is not None:
+            self.stats.on_serialize("json", time.perf_counter() - start, len(payload))
+
         if path is None:
-            return json.dumps(self.data)
+            return payload
         else:
-            with open(path, "w") as f:
-                json.dump(self.data, f)
+            write_text(path, payload)
+
+    async def ato_json(self, path: PathLike):
+        """
+        Save survey data to a JSON file without blocking the event loop. Survey data is serialized right away, and the file is written atomically on a worker thread.
+
+        Parameters
+        ----------
+        path: str
+            Path to the JSON file
+        """
+        payload = self.to_json()
+        await asyncio.wrap_future(write_text_nowait(path, payload))
+
+    def to_json_nowait(self, path: PathLike) -> Future:
+        """
+        Save survey data to a JSON file on a worker thread. Survey data is serialized right away, so that later answer changes are not included. The file is written atomically, and writes to the same file are applied in the order they were started.
+
+        Parameters
+        ----------
+        path: str
+            Path to the JSON file
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future completed once the file is written
+        """
+        return write_text_nowait(path, self.to_json())
+
+    def to_bytes(self, format: str = "json", compression: Optional[str] = None) -> bytes:
+        """
+        Serialize survey data to bytes
+
+        Parameters
+        ----------
+        format: str
+            Serialization format. One of "json" (using orjson if it is installed) or "msgpack" (requires msgpack). Default is "json".
+        compression: str
+            Optional compression. One of "gzip", "zlib", "bz2" or "lzma".
+
+        Returns
+        -------
+        bytes
+            Serialized survey data
+        """
+        start = time.perf_counter()
+        payload = serializers.dumps(self.data, format=format, compression=compression)
+        if self.stats is not None:
+            self.stats.on_serialize(format, time.perf_counter() - start, len(payload))
+        return payload
+
+    def from_bytes(
+        self, payload: bytes, format: str = "json", compression: Optional[str] = None, merge: Optional[str] = None
+    ):
+        """
+        Load survey data from bytes
 
-    def importer(self, label: str = "", **kwargs):
+        Parameters
+        ----------
+        payload: bytes
+            Serialized survey data
+        format: str
+            Serialization format. One of "json" or "msgpack". Default is "json".
+        compression: str
+            Optional compression. One of "gzip", "zlib", "bz2" or "lzma".
+        merge: str
+            Merge policy (see `from_file()`). If None (default), survey data is replaced.
+        """
+        data = serializers.loads(payload, format=format, compression=compression)
+        self._update({id: QuestionRecord(fields) for id, fields in data.items()}, merge=merge)
+
+    def _columns(self) -> Dict[str, list]:
+        columns = {"id": [], "label": [], "value": [], "widget_key": []}
+        ids, labels, values, widget_keys = columns.values()
+        for id, record in self.data.items():
+            ids.append(id)
+            labels.append(record.get("label"))
+            values.append(record.get("value"))
+            widget_keys.append(record.get("widget_key"))
+        return columns
+
+    def to_frame(self):
+        """
+        Export survey data to a pandas DataFrame with one row per question
+
+        Requires pandas to be installed.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with columns "id", "label", "value" and "widget_key"
+        """
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("`to_frame()` requires pandas. Install it with `pip install pandas`.") from e
+
+        return pd.DataFrame(self._columns())
+
+    def to_arrow(self):
+        """
+        Export survey data to a pyarrow Table with one row per question
+
+        Requires pyarrow to be installed. If answers have heterogeneous types (e.g. text and lists), the "value" column contains JSON-encoded answers.
+
+        Returns
+        -------
+        pyarrow.Table
+            Table with columns "id", "label", "value" and "widget_key"
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("`to_arrow()` requires pyarrow. Install it with `pip install pyarrow`.") from e
+
+        columns = self._columns()
+        try:
+            columns["value"] = pa.array(columns["value"])
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columns["value"] = pa.array([json.dumps(value) for value in columns["value"]], type=pa.string())
+        return pa.table(columns)
+
+    def importer(
+        self, label: str = "", stream: bool = False, format: str = "json", compression: Optional[str] = None, **kwargs
+    ):
         """
         Import survey data from a JSON file using a widget
 
@@ -207,7 +601,16 @@ class StreamlitSurvey:
         ----------
         label: str
             Label of the widget
+        stream: bool
+            Whether to parse the uploaded file incrementally (see `from_file()`). Only supported for uncompressed JSON files. Default is False.
+        format: str
+            Serialization format of the uploaded file (see `to_bytes()`). Default is "json".
+        compression: str
+            Compression of the uploaded file (see `to_bytes()`).
         """
+        binary = format != "json" or compression is not None
+        if stream and binary:
+            raise ValueError("Streaming import is only supported for uncompressed JSON files.")
         if "key" in kwargs:
             file_key = kwargs["key"]
         else:
@@ -217,26 +620,74 @@ class StreamlitSurvey:
             file = st.session_state[file_key]
             if file is None:
                 return
-            self.from_file(file)
+            if binary:
+                self.from_bytes(file.getvalue(), format=format, compression=compression)
+            else:
+                self.from_file(file, stream=stream)
 
-        file = st.file_uploader(label, type="json", key=file_key, on_change=load_json, **kwargs)
+        kwargs.setdefault("type", None if binary else "json")
+        file = st.file_uploader(label, key=file_key, on_change=load_json, **kwargs)
         return file
 
-    def download_button(self, label: str = "", file_name="survey.json", **kwargs):
+    def submit(self, collector: ResponseCollector, timeout: Optional[float] = 1.0) -> str:
+        """
+        Submit a snapshot of the survey data to a response collector shared by all sessions
+
+        Examples
+        --------
+        >>> import streamlit_survey as ss
+        >>> from streamlit_survey.collector import get_collector
+        >>>
+        >>> collector = get_collector("responses.db")
+        >>> survey = ss.StreamlitSurvey("My Survey")
+        >>> with survey.pages(2, on_submit=lambda: survey.submit(collector)) as pages:
+        >>>     ...
+
+        Parameters
+        ----------
+        collector: ResponseCollector
+            Response collector, e.g. from `streamlit_survey.collector.get_collector()`
+        timeout: float
+            Maximum number of seconds to wait if the collector's queue is full. If None, wait until there is room in the queue.
+
+        Returns
+        -------
+        str
+            ID of the submission
+        """
+        data = {id: encode_record(record) for id, record in self.data.items()}
+        return collector.submit(data, survey=self.label, timeout=timeout)
+
+    def download_button(
+        self,
+        label: str = "",
+        file_name="survey.json",
+        format: str = "json",
+        compression: Optional[str] = None,
+        **kwargs,
+    ):
         """
         Download survey data as a JSON file using a widget
 
+        The payload is cached across reruns and only re-serialized after survey answers have changed.
+
         Parameters
         ----------
         label: str
             Label of the widget
         file_name: str
             Name of the downloaded file
+        format: str
+            Serialization format (see `to_bytes()`). Default is "json".
+        compression: str
+            Optional compression (see `to_bytes()`).
         """
-        download = st.download_button(label, data=self.to_json(), file_name=file_name, **kwargs)
+        download = st.download_button(
+            label, data=self._cached_export(format, compression), file_name=file_name, **kwargs
+        )
         return download
 
-    def from_json(self, path: PathLike):
+    def from_json(self, path: PathLike, stream: Optional[bool] = None, merge: Optional[str] = None):
         """
         Load survey data from a JSON file
 
@@ -244,11 +695,65 @@ class StreamlitSurvey:
         ----------
         path: str
             Path to the JSON file. Can also be a URL.
+        stream: bool
+            Whether to parse the file incrementally (see `from_file()`). If None (default), URL responses are parsed as they are received and files are parsed at once.
+        merge: str
+            Merge policy (see `from_file()`). If None (default), survey data is replaced by the file's data.
+        """
+        if stream is None:
+            stream = is_url(path)
+        with open_json(path) as f:
+            self.from_file(f, stream=stream, merge=merge)
+
+    async def afrom_json(self, path: PathLike, stream: Optional[bool] = None, merge: Optional[str] = None):
+        """
+        Load survey data from a JSON file or URL without blocking the event loop. The file is read and parsed on a worker thread, and survey data is updated on the calling thread. See `from_json()` for the parameters.
+        """
+        records = await asyncio.get_running_loop().run_in_executor(
+            get_executor(), read_json_records, path, stream, QuestionRecord
+        )
+        self._update(records, merge=merge)
+
+    def from_json_nowait(self, path: PathLike, stream: Optional[bool] = None, merge: Optional[str] = None) -> Future:
         """
-        with open(path, "r") as f:
-            self.from_file(f)
+        Load survey data from a JSON file or URL on a worker thread
 
-    def from_file(self, file):
+        The file is read and parsed in the background, and survey data is updated at the start of the first rerun after loading completes, before any widget is displayed. Since Streamlit only reruns the script on user interaction, the import is applied on the user's next interaction after loading completes. Check `future.done()` to find out whether the import can be applied, e.g. in a fragment running periodically that calls `st.rerun()`. See `from_json()` for the parameters.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future of the loaded question records, by question ID. Loading errors are raised by the rerun that applies the import.
+        """
+        future = get_executor().submit(read_json_records, path, stream, QuestionRecord)
+        # Futures cannot be pickled, so the session state only holds the key of the import.
+        key = uuid.uuid4().hex
+        _pending_imports[key] = future
+        previous = st.session_state.get(self.pending_import_name)
+        if previous is not None:
+            # A new import replaces the previous one, which is no longer applied.
+            _pending_imports.pop(previous[0], None)
+        st.session_state[self.pending_import_name] = (key, merge)
+        return future
+
+    def _apply_pending_import(self):
+        """
+        Apply an import started by `from_json_nowait()`, if it completed.
+        """
+        pending = st.session_state.get(self.pending_import_name)
+        if pending is None:
+            return
+        key, merge = pending
+        future = _pending_imports.get(key)
+        if future is not None and not future.done():
+            return
+        # Imports whose future is missing were started by another process, e.g. before a server restart.
+        del st.session_state[self.pending_import_name]
+        if future is not None:
+            del _pending_imports[key]
+            self._update(future.result(), merge=merge)
+
+    def from_file(self, file, stream: bool = False, merge: Optional[str] = None):
         """
         Load survey data from a JSON file
 
@@ -256,15 +761,105 @@ class StreamlitSurvey:
         ----------
         file: file
             File object containing the JSON data
+        stream: bool
+            Whether to parse question entries one at a time instead of loading the whole JSON document in memory. Default is False.
+        merge: str
+            If None (default), survey data is replaced by the file's data. Otherwise, the file's entries are merged into survey data by question ID, and only changed entries are updated. Conflicts with existing entries are resolved according to the given policy:
+
+            - "overwrite": entries from the file replace existing entries.
+            - "keep": existing entries are kept.
+            - "latest": the most recently updated entry is kept, based on entries' "timestamp" field, which is recorded by surveys created with `timestamps=True`. Entries without a timestamp are considered older than any other.
         """
-        # Update survey data
-        self.data.clear()
-        self.data.update(json.load(file))
+        # Records are parsed completely before survey data is modified, so that a truncated or malformed file leaves survey data unchanged.
+        self._update(parse_json_records(file, stream=stream, record=QuestionRecord), merge=merge)
 
-        # Update displayed Streamlit widgets values
-        for _, data in self.data.items():
-            if "widget_key" in data and data["widget_key"] in st.session_state:
-                st.session_state[data["widget_key"]] = data["value"]
+    def _update(self, incoming: Dict[str, QuestionRecord], merge: Optional[str] = None):
+        """
+        Update survey data from question records, by question ID. See `from_file()` for the `merge` parameter.
+        """
+        if self.read_only:
+            raise ValueError(f"Survey {self.label!r} is read-only.")
+        if merge is not None and merge not in self.MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy {merge!r}. Expected one of {self.MERGE_POLICIES}.")
+        self._sync_run()
+
+        if merge is None:
+            self._invalidate_export()
+            self.changed_ids.update(self.data.keys())
+            self.data.clear()
+
+        updated_ids = set()
+        for id, record in incoming.items():
+            if merge is not None and id in self.data:
+                existing = self.data[id]
+                if record == existing or merge == "keep":
+                    continue
+                if merge == "latest" and (record["timestamp"] or 0) <= (existing.get("timestamp") or 0):
+                    continue
+                if self.storage is not None:
+                    for key in existing:
+                        if key not in record:
+                            self.storage.delete(id, key)
+                    for key, value in record.items():
+                        self.storage.write(id, key, value)
+            elif merge is not None and self.storage is not None:
+                for key, value in record.items():
+                    self.storage.write(id, key, value)
+
+            self.data[id] = record
+            updated_ids.add(id)
+            if merge is not None:
+                self._invalidate_export()
+
+        self.changed_ids.update(updated_ids)
+        if merge is None:
+            self.page_index.defaults.clear()
+            self.page_index.relocate()
+        for id in list(self.page_index.page_of) if merge is None else updated_ids:
+            record = self.data.get(id)
+            self.page_index.set_value(id, None if record is None else record.get("value"))
+        if self.rules is not None:
+            if merge is None:
+                self.rules.invalidate_all()
+            else:
+                self.rules.invalidate(updated_ids)
+        if merge is None and self.storage is not None:
+            self.storage.replace(self.data)
+        if self.autosave is not None:
+            if merge is None:
+                self.autosave.replace(self.data)
+            else:
+                for id in updated_ids:
+                    self.autosave.notify(id, self.data[id])
+
+        self._restore_widgets(None if merge is None else updated_ids)
+
+    def _restore_widgets(self, ids: Optional[set] = None):
+        """
+        Reset the state of registered widgets so that their values are restored from survey data when they are next displayed (see `StreamlitInput.register()`). Widgets of components that are not registered with the survey are not in `st.session_state` and are restored when they are displayed, so this only costs O(displayed components).
+
+        When no component is registered yet during the rerun (e.g. for imports at the top of the script), widgets of the previous rerun may still be in `st.session_state`, and their keys are taken from survey data instead.
+
+        Parameters
+        ----------
+        ids: set
+            IDs of the questions to restore. If None, all registered components are restored.
+        """
+        if self._components:
+            widget_keys = (
+                (component.id, component.kwargs["key"])
+                for component in self._components.values()
+                if ids is None or component.id in ids
+            )
+        else:
+            records = self.data.items() if ids is None else ((id, self.data[id]) for id in ids if id in self.data)
+            widget_keys = ((id, record.get("widget_key")) for id, record in records)
+
+        for id, widget_key in widget_keys:
+            if widget_key is not None and widget_key in st.session_state:
+                del st.session_state[widget_key]
+                if self.stats is not None:
+                    self.stats.on_restore(id, widget_key)
 
     def text_input(self, label: str = "", id: str = None, **kwargs) -> str:
         """
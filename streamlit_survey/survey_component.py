@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import datetime
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Optional
 
@@ -29,7 +30,7 @@ time_decoder = lambda obj: None if obj is None else datetime.datetime.strptime(o
 class SurveyComponent(ABC):
     COMPONENT_KEY_PREFIX = "__streamlit-survey-component"
 
-    def __init__(self, survey, label: str = "", id: Optional[str] = None, **kwargs):
+    def __init__(self, survey, label: str = "", id: Optional[str] = None, required: bool = False, **kwargs):
         """
         Parameters
         ----------
@@ -40,6 +41,8 @@ class SurveyComponent(ABC):
             Label of the component
         id: str
             ID of the component
+        required: bool
+            Whether the question must be answered before the survey is submitted. Only checked for components displayed within survey pages. The widget's initial value does not count as an answer.
         **kwargs: dict
             Keyword arguments to pass to the Streamlit input widget
         """
@@ -48,17 +51,19 @@ class SurveyComponent(ABC):
 
         self.id = id
         self.survey = survey
+        self.required = required
         self.kwargs = kwargs
-        self.label = label
         if "key" not in self.kwargs:
             self.kwargs["key"] = f"{self.COMPONENT_KEY_PREFIX}_{self.survey.label}_{self.id}"
-        self.key = self.kwargs["key"]
 
         survey._add_component(self)
+        self._label = label
+        self.label = label
+        self.key = self.kwargs["key"]
 
     @property
     def key(self):
-        return self.survey._get(self.id, "widget_key")
+        return self.kwargs["key"]
 
     @key.setter
     def key(self, key):
@@ -75,7 +80,9 @@ class SurveyComponent(ABC):
 
     @property
     def label(self):
-        return self.survey._get(self.id, "label")
+        label = self.survey._get(self.id, "label")
+        # Labels are not recorded by read-only surveys.
+        return self._label if label is None else label
 
     @label.setter
     def label(self, label):
@@ -97,11 +104,23 @@ class SurveyComponent(ABC):
         Any
             Value of the component
         """
-        self.register()
+        self.survey._mark_displayed(self)
+        if self.survey.stats is None:
+            self.register()
+        else:
+            start = time.perf_counter()
+            self.register()
+            self.survey.stats.on_register(self, time.perf_counter() - start)
         return self.value
 
     @classmethod
-    def from_st_input(cls, Class: type, encoder: Callable = lambda x: x, decoder: Callable = lambda x: x):
+    def from_st_input(
+        cls,
+        Class: type,
+        encoder: Callable = lambda x: x,
+        decoder: Callable = lambda x: x,
+        name: Optional[str] = None,
+    ):
         """
         This function automatically creates SurveyComponent subclasses for Streamlit inputs, allowing users to easily add new Streamlit inputs to the library.
 
@@ -113,6 +132,8 @@ class SurveyComponent(ABC):
             Function to encode the value before logging it
         decoder:
             Function to decode the value after retrieving it
+        name:
+            Name of the subclass, e.g. as reported by survey instrumentation. Defaults to the name of the Streamlit input in CamelCase (e.g. "TextInput" for `st.text_input`).
 
         Returns
         -------
@@ -122,13 +143,19 @@ class SurveyComponent(ABC):
 
         class StreamlitInput(SurveyComponent):
             def register(self):
-                if self.key not in st.session_state and self.value is not None:
+                read_only = self.survey.read_only
+                if (read_only or self.key not in st.session_state) and self.value is not None:
                     # Note: Streamlit widget keys get automatically deleted from st.session_state. This restores widgets to their default value when they are no longer displayed. To get around this issue, we automatically restore widget values from the survey data when it is available.
+                    # Widgets of read-only views always show the survey data, which can change between reruns.
                     st.session_state[self.key] = decoder(self.value)
 
-                value = Class(label=self.label, **self.kwargs)
+                kwargs = dict(self.kwargs, disabled=True) if read_only else self.kwargs
+                value = Class(label=self.label, **kwargs)
                 self.value = encoder(value)
 
+        if name is None:
+            name = "".join(part.capitalize() for part in getattr(Class, "__name__", "StreamlitInput").split("_"))
+        StreamlitInput.__name__ = StreamlitInput.__qualname__ = name
         return StreamlitInput
 
 
@@ -136,11 +163,11 @@ class SurveyComponent(ABC):
 TextInput = SurveyComponent.from_st_input(st.text_input)
 TextArea = SurveyComponent.from_st_input(st.text_area)
 NumberInput = SurveyComponent.from_st_input(st.number_input)
-MultiSelect = SurveyComponent.from_st_input(st.multiselect)
-SelectBox = SurveyComponent.from_st_input(st.selectbox)
+MultiSelect = SurveyComponent.from_st_input(st.multiselect, name="MultiSelect")
+SelectBox = SurveyComponent.from_st_input(st.selectbox, name="SelectBox")
 Radio = SurveyComponent.from_st_input(st.radio)
 Slider = SurveyComponent.from_st_input(st.slider)
 SelectSlider = SurveyComponent.from_st_input(st.select_slider)
-CheckBox = SurveyComponent.from_st_input(st.checkbox)
+CheckBox = SurveyComponent.from_st_input(st.checkbox, name="CheckBox")
 DateInput = SurveyComponent.from_st_input(st.date_input, encoder=date_encoder, decoder=date_decoder)
 TimeInput = SurveyComponent.from_st_input(st.time_input, encoder=time_encoder, decoder=time_decoder)
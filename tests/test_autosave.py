@@ -0,0 +1,138 @@
+import json
+import pickle
+import time
+
+import pytest
+
+from streamlit_survey.autosave import Autosaver, atomic_write
+from streamlit_survey.layered_data import LayeredData
+from streamlit_survey.question_record import QuestionRecord
+from streamlit_survey.storage import MemoryStorage
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self, failures=0):
+        super().__init__()
+        self.n_writes = 0
+        self.failures = failures
+
+    def write(self, id, key, value):
+        if self.failures > 0:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.n_writes += 1
+        super().write(id, key, value)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out")
+        time.sleep(0.01)
+
+
+def test_atomic_write(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write(path, b"first")
+    atomic_write(path, b"second")
+    assert path.read_bytes() == b"second"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_flush_writes_whole_data(tmp_path):
+    path = tmp_path / "survey.json"
+    saver = Autosaver(path, interval=60)
+    saver.bind({"Q1": QuestionRecord({"value": "a"})})
+    saver.notify("Q2", {"value": "b"})
+    saver.flush()
+    assert json.loads(path.read_text()) == {"Q1": {"value": "a"}, "Q2": {"value": "b"}}
+    saver.close()
+
+
+def test_rapid_edits_are_coalesced():
+    storage = CountingStorage()
+    saver = Autosaver(storage, max_changes=100, interval=60)
+    saver.bind({})
+    for text in ("h", "he", "hel", "hell", "hello"):
+        saver.notify("Q1", {"value": text})
+    saver.close()
+    assert storage.n_writes == 1
+    assert storage.load() == {"Q1": {"value": "hello"}}
+
+
+def test_flush_after_max_changes():
+    storage = CountingStorage()
+    saver = Autosaver(storage, max_changes=3, interval=60)
+    saver.bind({})
+    for i in range(3):
+        saver.notify(f"Q{i}", {"value": i})
+    wait_for(lambda: storage.n_writes == 3)
+    saver.close()
+
+
+def test_flush_after_interval():
+    storage = CountingStorage()
+    saver = Autosaver(storage, max_changes=100, interval=0.05)
+    saver.bind({})
+    saver.notify("Q1", {"value": 1})
+    wait_for(lambda: storage.n_writes == 1)
+    saver.close()
+
+
+def test_failed_flush_is_retried():
+    storage = CountingStorage(failures=1)
+    saver = Autosaver(storage, interval=60)
+    saver.bind({})
+    saver.notify("Q1", {"value": 1})
+    with pytest.raises(OSError):
+        saver.flush()
+    assert isinstance(saver.last_error, OSError)
+
+    saver.notify("Q2", {"value": 2})
+    saver.flush()
+    assert saver.last_error is None
+    assert storage.load() == {"Q1": {"value": 1}, "Q2": {"value": 2}}
+    saver.close()
+
+
+def test_background_flush_is_retried():
+    storage = CountingStorage(failures=1)
+    saver = Autosaver(storage, interval=0.05)
+    saver.bind({})
+    saver.notify("Q1", {"value": 1})
+    wait_for(lambda: storage.n_writes == 1)
+    assert saver.last_error is None
+    saver.close()
+
+
+def test_layered_base_is_not_copied(tmp_path):
+    path = tmp_path / "survey.json"
+    base = {"Q1": {"value": "prefilled"}, "Q2": {"value": "prefilled"}}
+    data = LayeredData(base)
+    data.writable("Q2")["value"] = "changed"
+    saver = Autosaver(path, interval=60)
+    saver.bind(data)
+    assert "Q1" not in saver._snapshot
+
+    saver.notify("Q3", {"value": "new"})
+    saver.flush()
+    assert json.loads(path.read_text()) == {
+        "Q1": {"value": "prefilled"},
+        "Q2": {"value": "changed"},
+        "Q3": {"value": "new"},
+    }
+    saver.close()
+
+
+def test_pickle_keeps_pending_changes(tmp_path):
+    path = tmp_path / "survey.json"
+    saver = Autosaver(path, interval=60)
+    saver.bind({})
+    saver.notify("Q1", {"value": 1})
+
+    restored = pickle.loads(pickle.dumps(saver))
+    restored.bind({})
+    restored.close()
+    assert json.loads(path.read_text()) == {"Q1": {"value": 1}}
+    saver.close()
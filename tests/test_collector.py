@@ -0,0 +1,107 @@
+import queue
+import threading
+
+import pytest
+
+from streamlit_survey.collector import ResponseCollector
+
+
+@pytest.mark.parametrize("filename", ["responses.db", "responses.jsonl"])
+def test_submissions_are_written(tmp_path, filename):
+    collector = ResponseCollector(tmp_path / filename, batch_size=3)
+    ids = [collector.submit({"Q1": {"value": i}}, survey="My Survey") for i in range(10)]
+    collector.flush()
+    responses = collector.responses()
+    assert sorted(response["id"] for response in responses) == sorted(ids)
+    assert sorted(response["data"]["Q1"]["value"] for response in responses) == list(range(10))
+    assert {response["survey"] for response in responses} == {"My Survey"}
+    collector.close()
+
+
+def test_incomplete_line_is_truncated(tmp_path):
+    path = tmp_path / "responses.jsonl"
+    collector = ResponseCollector(path)
+    collector.submit({"Q1": {"value": 1}})
+    collector.close()
+    with open(path, "ab") as f:
+        f.write(b'{"id": "interrupted", "data": {"Q1"')
+
+    collector = ResponseCollector(path)
+    collector.submit({"Q1": {"value": 2}})
+    collector.close()
+    assert [response["data"]["Q1"]["value"] for response in collector.responses()] == [1, 2]
+
+
+def test_failed_batch_is_retried(tmp_path, monkeypatch):
+    collector = ResponseCollector(tmp_path / "responses.jsonl")
+    write = collector._write
+    failures = [OSError("disk full")]
+
+    def flaky_write(conn, submissions):
+        if failures:
+            raise failures.pop()
+        write(conn, submissions)
+
+    monkeypatch.setattr(collector, "_write", flaky_write)
+    monkeypatch.setattr("streamlit_survey.collector.time.sleep", lambda seconds: None)
+    collector.submit({"Q1": {"value": 1}})
+    collector.flush()
+    assert collector.last_error is None
+    assert len(collector.responses()) == 1
+    collector.close()
+
+
+def test_full_queue_raises(tmp_path, monkeypatch):
+    unblocked = threading.Event()
+    collector = ResponseCollector(tmp_path / "responses.jsonl", maxsize=1, batch_size=1)
+    write = collector._write
+
+    def blocking_write(conn, submissions):
+        unblocked.wait()
+        write(conn, submissions)
+
+    monkeypatch.setattr(collector, "_write", blocking_write)
+    collector.submit({"Q1": {"value": 1}})
+    # Waits until the blocked writer thread took the first submission, and fills the queue.
+    collector.submit({"Q1": {"value": 2}}, timeout=None)
+    with pytest.raises(queue.Full):
+        collector.submit({"Q1": {"value": 3}}, timeout=0.01)
+    unblocked.set()
+    collector.close()
+    assert [response["data"]["Q1"]["value"] for response in collector.responses()] == [1, 2]
+
+
+def test_closed_collector_rejects_submissions(tmp_path):
+    collector = ResponseCollector(tmp_path / "responses.db")
+    collector.close()
+    with pytest.raises(RuntimeError):
+        collector.submit({})
+
+
+def test_retried_batch_is_not_duplicated(tmp_path, monkeypatch):
+    path = tmp_path / "responses.jsonl"
+    unblocked = threading.Event()
+    collector = ResponseCollector(path)
+    write = collector._write
+    failures = [OSError("disk full")]
+
+    def partial_write(conn, submissions):
+        unblocked.wait()
+        if len(submissions) > 1 and failures:
+            # Write the first submission and part of the second one before failing.
+            write(conn, submissions[:1])
+            with open(path, "ab") as f:
+                f.write(b'{"id": "partial"')
+            raise failures.pop()
+        write(conn, submissions)
+
+    monkeypatch.setattr(collector, "_write", partial_write)
+    monkeypatch.setattr("streamlit_survey.collector.time.sleep", lambda seconds: None)
+    # The writer thread is blocked on the first submission while the next two are queued, and written in one batch.
+    for i in range(3):
+        collector.submit({"Q1": {"value": i}}, timeout=None)
+    unblocked.set()
+    collector.flush()
+    collector.close()
+    assert not failures
+    assert [response["data"]["Q1"]["value"] for response in collector.responses()] == [0, 1, 2]
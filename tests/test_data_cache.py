@@ -0,0 +1,47 @@
+import json
+import os
+
+from streamlit_survey.data_cache import SurveyDataCache, estimate_size
+
+
+def write_survey(path, n, value="answer"):
+    with open(path, "w") as f:
+        json.dump({f"Q{i}": {"label": f"Question {i}", "value": value} for i in range(n)}, f)
+
+
+def test_cache_is_reused_until_file_changes(tmp_path):
+    path = tmp_path / "survey.json"
+    write_survey(path, 10)
+    cache = SurveyDataCache()
+    data = cache.load(path)
+    assert cache.load(path) is data
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    write_survey(path, 10, value="changed answer")
+    assert cache.load(path)["Q0"]["value"] == "changed answer"
+    assert len(cache) == 1
+
+
+def test_cost_is_estimated_memory(tmp_path):
+    path = tmp_path / "survey.json"
+    write_survey(path, 1000)
+    cache = SurveyDataCache()
+    data = cache.load(path)
+    assert cache.n_bytes == estimate_size(dict(data))
+    assert cache.n_bytes > os.path.getsize(path)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    paths = [tmp_path / f"survey_{i}.json" for i in range(3)]
+    for path in paths:
+        write_survey(path, 100)
+    size = estimate_size(dict(SurveyDataCache().load(paths[0])))
+    cache = SurveyDataCache(max_bytes=2 * size)
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+    assert len(cache) == 2
+    assert cache.n_bytes <= cache.max_bytes
+    cache.load(paths[0])
+    assert cache.hits == 2
@@ -0,0 +1,48 @@
+import threading
+
+from streamlit_survey import file_io
+
+
+def test_write_text_nowait_keeps_latest_payload(tmp_path):
+    path = tmp_path / "survey.json"
+    futures = [file_io.write_text_nowait(path, str(i)) for i in range(50)]
+    for future in futures:
+        future.result()
+    assert path.read_text() == "49"
+    assert [p.name for p in tmp_path.iterdir()] == ["survey.json"]
+
+
+def test_older_write_does_not_overwrite_newer_one(tmp_path, monkeypatch):
+    path = tmp_path / "survey.json"
+    started, unblocked = threading.Event(), threading.Event()
+    atomic_write = file_io.atomic_write
+
+    def slow_atomic_write(path, payload):
+        if payload == b"old":
+            started.set()
+            unblocked.wait()
+        atomic_write(path, payload)
+
+    monkeypatch.setattr(file_io, "atomic_write", slow_atomic_write)
+    old = file_io.write_text_nowait(path, "old")
+    started.wait()
+    new = file_io.write_text_nowait(path, "new")
+    unblocked.set()
+    old.result()
+    new.result()
+    assert path.read_text() == "new"
+
+    # An older write still waiting for the lock is skipped once a newer write completed.
+    state, version = file_io._next_write(path)
+    file_io.write_text(path, "newest")
+    file_io._write_version(path, "stale", state, version)
+    assert path.read_text() == "newest"
+
+
+def test_read_json_records(tmp_path):
+    path = tmp_path / "survey.json"
+    path.write_text('{"Q1": {"value": 1}, "Q2": {"value": [2, 3]}}')
+    expected = {"Q1": {"value": 1}, "Q2": {"value": [2, 3]}}
+    assert file_io.read_json_records(path) == expected
+    assert file_io.read_json_records(path, stream=True) == expected
+    assert file_io.read_json_records(path.as_uri()) == expected
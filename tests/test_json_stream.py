@@ -0,0 +1,32 @@
+import io
+import json
+
+import pytest
+
+from streamlit_survey.json_stream import iter_json_items
+
+DOCUMENT = {
+    "Q1": {"value": "café \U0001f44d", "label": 'Say "hi"'},
+    "Q2": {"value": [1, 2.5, None, True], "widget_key": "key"},
+    "Q3": {},
+    "": {"value": {"nested": {"deep": [{}]}}},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+@pytest.mark.parametrize("binary", [False, True])
+def test_items_are_parsed_across_chunk_boundaries(chunk_size, binary):
+    text = json.dumps(DOCUMENT, ensure_ascii=False, indent=2)
+    file = io.BytesIO(text.encode("utf-8")) if binary else io.StringIO(text)
+    assert dict(iter_json_items(file, chunk_size=chunk_size)) == DOCUMENT
+
+
+@pytest.mark.parametrize("text", ["{}", " { } "])
+def test_empty_object(text):
+    assert list(iter_json_items(io.StringIO(text), chunk_size=1)) == []
+
+
+@pytest.mark.parametrize("text", ['{"Q1": {"value": 1}', '{"Q1": {"value": 1},', '{"Q1" {}}', "[]", ""])
+def test_malformed_documents_raise(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(io.StringIO(text), chunk_size=2))
@@ -0,0 +1,47 @@
+import pickle
+from types import MappingProxyType
+
+from streamlit_survey.layered_data import LayeredData
+from streamlit_survey.question_record import QuestionRecord
+
+
+def test_writes_do_not_modify_base():
+    base = MappingProxyType({"Q1": {"value": "a"}, "Q2": {"value": "b"}})
+    data = LayeredData(base)
+    data.writable("Q1")["value"] = "changed"
+    data["Q3"] = QuestionRecord({"value": "c"})
+    assert base["Q1"] == {"value": "a"}
+    assert {id: record["value"] for id, record in data.items()} == {"Q1": "changed", "Q2": "b", "Q3": "c"}
+    assert len(data) == 3
+
+
+def test_base_records_are_not_copied_on_read():
+    base = {"Q1": {"value": "a"}}
+    data = LayeredData(base)
+    assert data["Q1"] is base["Q1"]
+    assert not data.overlay
+
+
+def test_pickle_leaves_out_base():
+    base = MappingProxyType({"Q1": {"value": "a"}, "Q2": {"value": "b"}})
+    data = LayeredData(base)
+    data.writable("Q2")["value"] = "changed"
+
+    restored = pickle.loads(pickle.dumps(data))
+    assert list(restored) == ["Q2"]
+    restored.rebase(base)
+    assert {id: record["value"] for id, record in restored.items()} == {"Q2": "changed", "Q1": "a"}
+
+
+def test_clear_detaches_base():
+    data = LayeredData({"Q1": {"value": "a"}})
+    data.clear()
+    data.rebase({"Q1": {"value": "a"}})
+    assert len(data) == 0
+
+
+def test_rebase_drops_deletions_missing_from_new_base():
+    data = LayeredData({"Q1": {"value": "a"}, "Q2": {"value": "b"}})
+    del data["Q1"]
+    data.rebase({"Q2": {"value": "b"}, "Q3": {"value": "c"}})
+    assert len(data) == len(list(data)) == 2
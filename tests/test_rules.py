@@ -0,0 +1,41 @@
+import pytest
+
+from streamlit_survey.rules import BoundRules, RuleEngine
+
+
+class FakeSurvey(object):
+    # Rules only read survey answers.
+    def __init__(self, answers):
+        self.data = {id: {"value": value} for id, value in answers.items()}
+
+    def _get(self, id, key):
+        return self.data.get(id, {}).get(key)
+
+
+@pytest.fixture
+def rules():
+    rules = RuleEngine()
+    rules.show_if("Q1_1", {"Q1": "yes"})
+    rules.add_rule("Q1_2", ["Q1_1"], lambda q1_1: q1_1 is not None and len(q1_1) > 3)
+    return rules
+
+
+def test_reachability_follows_dependencies(rules):
+    survey = FakeSurvey({"Q1": "yes", "Q1_1": "long answer"})
+    bound = BoundRules(rules, survey, {})
+    assert bound.is_reachable("Q0") and bound.is_reachable("Q1_1") and bound.is_reachable("Q1_2")
+
+    survey.data["Q1"]["value"] = "no"
+    assert bound.is_reachable("Q1_2")  # Cached until invalidated
+    bound.invalidate(["Q1"])
+    assert not bound.is_reachable("Q1_1")
+    assert not bound.is_reachable("Q1_2")
+    assert bound.unreachable_ids() == ["Q1_1"]
+
+
+def test_cycles_and_duplicate_rules_are_rejected(rules):
+    with pytest.raises(ValueError):
+        rules.add_rule("Q1", ["Q1_2"], lambda q1_2: True)
+    with pytest.raises(ValueError):
+        rules.show_if("Q1_1", {"Q1": "no"})
+    assert rules.descendants(["Q1"]) == {"Q1_1", "Q1_2"}
@@ -0,0 +1,48 @@
+import pytest
+
+from streamlit_survey.storage import AppendOnlyFileStorage, MemoryStorage, SQLiteStorage
+
+
+@pytest.fixture(params=["memory", "sqlite", "journal"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        storage = MemoryStorage()
+    elif request.param == "sqlite":
+        storage = SQLiteStorage(tmp_path / "survey.db", namespace="respondent-1")
+    else:
+        storage = AppendOnlyFileStorage(tmp_path / "survey.journal")
+    yield storage
+    storage.close()
+
+
+def test_fields_are_written_and_deleted(storage):
+    storage.write("Q1", "value", "a")
+    storage.write("Q1", "label", "Question 1")
+    storage.write("Q2", "value", [1, 2])
+    storage.delete("Q1", "label")
+    assert storage.load() == {"Q1": {"value": "a"}, "Q2": {"value": [1, 2]}}
+
+    storage.replace({"Q3": {"value": None}})
+    assert storage.load() == {"Q3": {"value": None}}
+
+
+def test_torn_journal_record_is_ignored(tmp_path):
+    path = tmp_path / "survey.journal"
+    storage = AppendOnlyFileStorage(path)
+    storage.write("Q1", "value", "a")
+    with open(path, "a") as f:
+        f.write('["Q1", "value", "interru')
+
+    storage = AppendOnlyFileStorage(path)
+    assert storage.load() == {"Q1": {"value": "a"}}
+    storage.write("Q2", "value", "b")
+    assert AppendOnlyFileStorage(path).load() == {"Q1": {"value": "a"}, "Q2": {"value": "b"}}
+
+
+def test_compaction_keeps_data(tmp_path):
+    storage = AppendOnlyFileStorage(tmp_path / "survey.journal", compact_every=3)
+    for i in range(5):
+        storage.write("Q1", "value", i)
+    storage.delete("Q1", "value")
+    storage.write("Q2", "value", "b")
+    assert AppendOnlyFileStorage(tmp_path / "survey.journal").load() == {"Q1": {}, "Q2": {"value": "b"}}
@@ -0,0 +1,144 @@
+import io
+import json
+import pickle
+from types import MappingProxyType
+
+import pytest
+import streamlit as st
+
+import streamlit_survey as ss
+from streamlit_survey.collector import ResponseCollector
+from streamlit_survey.storage import MemoryStorage
+
+
+def make_survey(request, **kwargs):
+    # Survey data is kept in the session state under the survey label, hence one label per test.
+    return ss.StreamlitSurvey(request.node.name, **kwargs)
+
+
+def test_truncated_import_leaves_data_unchanged(request):
+    storage = MemoryStorage()
+    survey = make_survey(request, storage=storage)
+    survey.from_file(io.StringIO(json.dumps({"Q1": {"value": "old"}, "Q2": {"value": "old"}})))
+
+    with pytest.raises(json.JSONDecodeError):
+        survey.from_file(io.StringIO('{"Q1": {"value": "new"}, "Q2": {"value": '), stream=True)
+    assert json.loads(survey.to_json()) == {"Q1": {"value": "old"}, "Q2": {"value": "old"}}
+    assert storage.load() == {"Q1": {"value": "old"}, "Q2": {"value": "old"}}
+
+
+def test_export_cache_follows_survey_data(request):
+    survey = make_survey(request, data={"Q1": {"value": "a"}}, read_only=True)
+    assert json.loads(survey._cached_export()) == {"Q1": {"value": "a"}}
+
+    survey = make_survey(request, data={"Q1": {"value": "b"}}, read_only=True)
+    assert json.loads(survey._cached_export()) == {"Q1": {"value": "b"}}
+
+
+def test_jump_requires_visiting_every_page(request):
+    survey = make_survey(request)
+    pages = survey.pages(3, jump=True, on_submit=lambda: None)
+    for page in (0, 2):
+        pages.current = page
+        with pages:
+            survey.text_input("Name", id=f"name_{page}")
+    survey.from_file(
+        io.StringIO(json.dumps({"name_0": {"value": "Ada"}, "name_2": {"value": "Ada"}})), merge="overwrite"
+    )
+    assert not pages.is_complete()
+
+    pages.current = 1
+    with pages:
+        survey.text_input("Age", id="age", required=True)
+    assert not pages.is_complete()
+    assert pages.completion == 2 / 3
+
+    survey.from_file(io.StringIO(json.dumps({"age": {"value": "36"}})), merge="overwrite")
+    assert pages.is_complete()
+    assert pages.completion == 1
+
+
+def test_read_only_view_displays_disabled_components():
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit as st
+
+        import streamlit_survey as ss
+
+        data = {"Q1": {"value": st.session_state.get("answer", "a")}}
+        survey = ss.StreamlitSurvey("Review", data=data, read_only=True)
+        survey.text_input("Q1", id="Q1")
+        survey.text_input("Q2", id="Q2")
+
+    at = AppTest.from_function(app).run()
+    assert [widget.disabled for widget in at.text_input] == [True, True]
+    at.session_state["answer"] = "b"
+    at.run()
+    assert not at.exception
+    assert at.text_input[0].value == "b"
+
+
+def test_pending_import_keeps_session_state_picklable(request, tmp_path):
+    path = tmp_path / "survey.json"
+    path.write_text(json.dumps({"Q1": {"value": "imported"}}))
+    survey = make_survey(request)
+    survey.from_json_nowait(str(path)).result()
+    pickle.dumps(st.session_state[survey.pending_import_name])
+
+    survey = make_survey(request)
+    assert survey.data["Q1"]["value"] == "imported"
+    assert survey.pending_import_name not in st.session_state
+
+
+def test_submit_encodes_base_records(request, tmp_path):
+    collector = ResponseCollector(tmp_path / "responses.jsonl")
+    survey = make_survey(request, base=MappingProxyType({"Q1": MappingProxyType({"value": "a"})}))
+    survey.submit(collector)
+    collector.close()
+    assert [response["data"] for response in collector.responses()] == [{"Q1": {"value": "a"}}]
+
+
+def test_imported_answers_are_located_with_page_of(request):
+    survey = make_survey(request)
+    survey.from_file(io.StringIO(json.dumps({"page_0": {"value": "a"}, "other": {"value": "b"}})))
+    pages = survey.pages(3, page_of=lambda id: int(id.split("_")[1]) if id.startswith("page_") else None)
+    assert pages.find_unanswered() == 1
+
+    survey.from_file(io.StringIO(json.dumps({"page_1": {"value": "c"}})), merge="overwrite")
+    assert pages.find_unanswered() == 2
+    assert pages.is_answered(0) and pages.is_answered(1)
+
+
+@pytest.mark.parametrize(
+    "merge, expected",
+    [
+        ("keep", {"Q1": {"value": "old", "timestamp": 2.0, "label": "Q1"}, "Q2": {"value": "new"}}),
+        ("overwrite", {"Q1": {"value": "new", "timestamp": 1.0}, "Q2": {"value": "new"}}),
+        ("latest", {"Q1": {"value": "old", "timestamp": 2.0, "label": "Q1"}, "Q2": {"value": "new"}}),
+    ],
+)
+def test_merge_policies(request, merge, expected):
+    storage = MemoryStorage()
+    survey = make_survey(request, storage=storage)
+    survey.from_file(io.StringIO(json.dumps({"Q1": {"value": "old", "timestamp": 2.0, "label": "Q1"}})))
+    survey.from_file(
+        io.StringIO(json.dumps({"Q1": {"value": "new", "timestamp": 1.0}, "Q2": {"value": "new"}})), merge=merge
+    )
+    assert json.loads(survey.to_json()) == expected
+    assert storage.load() == expected
+
+
+def test_latest_merge_keeps_newer_entries(request):
+    survey = make_survey(request, timestamps=True)
+    survey.from_file(io.StringIO(json.dumps({"Q1": {"value": "old", "timestamp": 1.0}})))
+    survey.from_file(io.StringIO(json.dumps({"Q1": {"value": "new", "timestamp": 2.0}})), merge="latest")
+    assert json.loads(survey.to_json()) == {"Q1": {"value": "new", "timestamp": 2.0}}
+
+
+def test_stats_report_public_component_names(request):
+    survey = make_survey(request, stats=True)
+    survey.selectbox("Choice", options=["a", "b"], id="Q1")
+    survey.multiselect("Choices", options=["a", "b"], id="Q2")
+    survey.checkbox("Agree", id="Q3")
+    assert set(survey.stats.register_seconds) == {"SelectBox", "MultiSelect", "CheckBox"}